@@ -4,16 +4,22 @@ All API keys and settings loaded from environment variables / .env file.
 Copy .env.example to .env and fill in your keys.
 """
 
-from pydantic_settings import BaseSettings
+from dataclasses import dataclass, field, fields
 from functools import lru_cache
-from typing import Optional, List
+from typing import Optional, List, Union, get_args, get_origin
+import json
+import os
 
+from dotenv import load_dotenv
 
-class Settings(BaseSettings):
+
+@dataclass(slots=True, frozen=True)
+class Settings:
     # ── Alpha Vantage ──────────────────────────────────────────────────────────
     ALPHA_VANTAGE_API_KEY: str = "your_alpha_vantage_key_here"
     ALPHA_VANTAGE_BASE_URL: str = "https://www.alphavantage.co/query"
     ALPHA_VANTAGE_DAILY_LIMIT: int = 25  # Free tier: 25 req/day
+    ALPHA_VANTAGE_MINUTE_LIMIT: int = 5  # Free tier: 5 req/min
 
     # ── Twelve Data ───────────────────────────────────────────────────────────
     TWELVEDATA_API_KEY: str = "your_twelvedata_key_here"
@@ -73,9 +79,9 @@ class Settings(BaseSettings):
     MONTE_CARLO_PATHS: int = 10_000         # 10k default, up to 100k for production
     
     # ── VaR/ES Configuration ──────────────────────────────────────────────────
-    VAR_CONFIDENCE_LEVELS: List[float] = [0.90, 0.95, 0.99]
-    ES_CONFIDENCE_LEVELS: List[float] = [0.95, 0.99]
-    VAR_TIME_HORIZONS: List[int] = [1, 10]  # days
+    VAR_CONFIDENCE_LEVELS: List[float] = field(default_factory=lambda: [0.90, 0.95, 0.99])
+    ES_CONFIDENCE_LEVELS: List[float] = field(default_factory=lambda: [0.95, 0.99])
+    VAR_TIME_HORIZONS: List[int] = field(default_factory=lambda: [1, 10])  # days
     
     # ── Distribution Settings ─────────────────────────────────────────────────
     DISTRIBUTION_MODEL: str = "auto"  # auto | normal | student_t | lognormal | exponential
@@ -90,15 +96,46 @@ class Settings(BaseSettings):
     CAPIQ_API_KEY: Optional[str] = None
     CAPIQ_ENABLED: bool = False
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
+
+_TRUTHY = {"1", "true", "yes", "on", "y", "t"}
+
+
+def _cast(raw: str, tp):
+    """Convert an environment string to the field's declared type."""
+    if get_origin(tp) is Union:                      # Optional[X]
+        tp = next(a for a in get_args(tp) if a is not type(None))
+    if tp is bool:
+        return raw.strip().lower() in _TRUTHY
+    if tp is int:
+        return int(raw)
+    if tp is float:
+        return float(raw)
+    if get_origin(tp) is list:                       # JSON array, e.g. [0.95, 0.99]
+        item = get_args(tp)[0]
+        return [item(v) for v in json.loads(raw)]
+    return raw
+
+
+def _load() -> Settings:
+    # Real environment variables take precedence over .env entries
+    load_dotenv(".env", encoding="utf-8", override=False)
+    env = os.environ
+    overrides = {f.name: _cast(env[f.name], f.type) for f in fields(Settings) if f.name in env}
+    return Settings(**overrides)
 
 
 @lru_cache()
 def get_settings() -> Settings:
-    return Settings()
+    return _load()
 
 
 settings = get_settings()
+
+# ── Hot-path constants ────────────────────────────────────────────────────────
+# Plain module-level values for code that reads them on every polling tick.
+ALERT_CHECK_INTERVAL_SECONDS: int = settings.ALERT_CHECK_INTERVAL_SECONDS
+ALERT_COOLDOWN_HOURS: int         = settings.ALERT_COOLDOWN_HOURS
+MONTE_CARLO_PATHS: int            = settings.MONTE_CARLO_PATHS
+
+# Per-request access logging is only worth its cost while developing locally.
+ACCESS_LOG: bool = settings.APP_ENV == "development"
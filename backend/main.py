@@ -3,6 +3,9 @@ CLARA — Clairvoyant Loss Avoidance & Risk Advisor
 FastAPI Python Backend
 
 Run with:
+    python run.py                              # uvloop + httptools, no access log
+
+For local development with auto-reload:
     uvicorn main:app --reload --port 8000
 
 Or via Docker:
@@ -12,25 +15,14 @@ Or via Docker:
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+from types import ModuleType
+from typing import Dict
 import asyncio
+import importlib
 import logging
 
-from routers import (
-    stocks,
-    portfolio,
-    alerts,
-    risk,
-    regime,
-    hedges,
-    analogs,
-    simulation,
-    audit,
-    system_health,
-    ten_k_risks,
-    chat,
-)
-from services.alert_agent import alert_agent
 from config import settings
 
 # ── Logging ────────────────────────────────────────────────────────────────────
@@ -46,6 +38,7 @@ logger = logging.getLogger("CLARA")
 async def lifespan(app: FastAPI):
     """Start background tasks on startup, clean up on shutdown."""
     logger.info("🚀 CLARA Backend starting up...")
+    from services.alert_agent import alert_agent
     # Start the alert monitoring agent
     task = asyncio.create_task(alert_agent.run_monitoring_loop())
     yield
@@ -55,6 +48,14 @@ async def lifespan(app: FastAPI):
         await task
     except asyncio.CancelledError:
         pass
+    # Close pooled outbound HTTP clients
+    from services import alpha_vantage, email_service
+    from services.ai_analysis_service import ai_analysis_service
+    from services.watsonx_orchestrate_service import watsonx_orchestrate_service
+    await alpha_vantage.aclose()
+    await email_service.aclose()
+    await ai_analysis_service.aclose()
+    await watsonx_orchestrate_service.aclose()
 
 
 # ── App ────────────────────────────────────────────────────────────────────────
@@ -67,42 +68,91 @@ app = FastAPI(
     ),
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # ── CORS (allow the Vite frontend) ────────────────────────────────────────────
-# Allow localhost for development and Vercel/production domains
+# Explicit allow-list: origins are checked by set membership, and credentialed
+# requests never take the wildcard origin-echo path.
 allowed_origins = [
-    "http://localhost:5173",  # Vite dev server
-    "http://localhost:4173",  # Vite preview
-    "https://*.vercel.app",   # Vercel preview deployments
     "https://clara-risk.vercel.app",  # Production (update with your actual domain)
 ]
 
-# In development, allow all origins
+# Local Vite servers in development
 if settings.APP_ENV == "development":
-    allowed_origins.append("*")
+    allowed_origins += [
+        "http://localhost:5173",  # Vite dev server
+        "http://localhost:4173",  # Vite preview
+        "http://127.0.0.1:5173",
+        "http://127.0.0.1:4173",
+    ]
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
+    allow_origin_regex=r"https://[a-z0-9-]+\.vercel\.app",  # Vercel preview deployments
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
 )
 
 # ── Routers ────────────────────────────────────────────────────────────────────
-app.include_router(stocks.router,        prefix="/api/stocks",      tags=["Stocks"])
-app.include_router(portfolio.router,     prefix="/api/portfolio",   tags=["Portfolio"])
-app.include_router(alerts.router,        prefix="/api/alerts",      tags=["Alerts"])
-app.include_router(risk.router,          prefix="/api/risk",        tags=["Risk Engine"])
-app.include_router(regime.router,        prefix="/api/regime",      tags=["Regime Engine"])
-app.include_router(hedges.router,        prefix="/api/hedges",      tags=["Hedge Engine"])
-app.include_router(analogs.router,       prefix="/api/analogs",     tags=["Historical Analogs"])
-app.include_router(simulation.router,    prefix="/api/simulation",  tags=["Monte Carlo"])
-app.include_router(audit.router,         prefix="/api/audit",       tags=["Audit Trail"])
-app.include_router(system_health.router, prefix="/api/health",      tags=["System Health"])
-app.include_router(ten_k_risks.router,   prefix="/api/10k",         tags=["10-K Analysis"])
-app.include_router(chat.router,          prefix="/api/chat",        tags=["Chat"])
+# Each router module is imported and mounted on the first request under its
+# prefix, so a cold start only pays for the routers it actually serves.
+ROUTERS = [
+    ("stocks",        "/api/stocks",      ["Stocks"]),
+    ("portfolio",     "/api/portfolio",   ["Portfolio"]),
+    ("alerts",        "/api/alerts",      ["Alerts"]),
+    ("risk",          "/api/risk",        ["Risk Engine"]),
+    ("regime",        "/api/regime",      ["Regime Engine"]),
+    ("hedges",        "/api/hedges",      ["Hedge Engine"]),
+    ("analogs",       "/api/analogs",     ["Historical Analogs"]),
+    ("simulation",    "/api/simulation",  ["Monte Carlo"]),
+    ("audit",         "/api/audit",       ["Audit Trail"]),
+    ("system_health", "/api/health",      ["System Health"]),
+    ("ten_k_risks",   "/api/10k",         ["10-K Analysis"]),
+    ("chat",          "/api/chat",        ["Chat"]),
+]
+
+_loaded_routers: Dict[str, ModuleType] = {}
+
+
+def _load_router(name: str, prefix: str, tags: list) -> None:
+    if name in _loaded_routers:
+        return
+    module = importlib.import_module(f"routers.{name}")
+    app.include_router(module.router, prefix=prefix, tags=tags)
+    _loaded_routers[name] = module
+    logger.debug("Mounted router %s at %s", name, prefix)
+
+
+def load_all_routers() -> None:
+    """Mount every router (used for the OpenAPI schema)."""
+    for name, prefix, tags in ROUTERS:
+        _load_router(name, prefix, tags)
+    app.openapi_schema = None
+
+
+class LazyRouterMiddleware:
+    """Mount the router owning the request path before routing happens."""
+
+    def __init__(self, asgi_app) -> None:
+        self.app = asgi_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and len(_loaded_routers) < len(ROUTERS):
+            path = scope["path"]
+            if path == app.openapi_url:
+                load_all_routers()
+            else:
+                for name, prefix, tags in ROUTERS:
+                    if path == prefix or path.startswith(prefix + "/"):
+                        _load_router(name, prefix, tags)
+                        break
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(LazyRouterMiddleware)
 
 
 # ── Root ───────────────────────────────────────────────────────────────────────
@@ -119,6 +169,7 @@ async def root():
 
 @app.get("/api/status", tags=["Root"])
 async def status():
+    from services.alert_agent import alert_agent
     return {
         "status": "operational",
         "alert_agent": alert_agent.status,
@@ -3,10 +3,45 @@ CLARA — Pydantic Data Models / Schemas
 All request/response shapes for the API.
 """
 
-from pydantic import BaseModel, Field, EmailStr, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List, Dict, Any
+from typing_extensions import TypedDict
 from datetime import datetime, date
 from enum import Enum
+import re
+import time
+
+
+# ── Coarse timestamps ────────────────────────────────────────────────────────
+# Default factories run once per model instance; batch endpoints build dozens
+# of models per request, so the current time is refreshed at most once a second.
+_TS_CACHE: List[Any] = [0.0, datetime.utcfromtimestamp(0), ""]
+
+
+def _refresh_ts() -> None:
+    now = time.time()
+    if now - _TS_CACHE[0] > 1.0:
+        dt = datetime.utcfromtimestamp(now)
+        _TS_CACHE[0] = now
+        _TS_CACHE[1] = dt
+        _TS_CACHE[2] = dt.isoformat()
+
+
+def _utcnow() -> datetime:
+    _refresh_ts()
+    return _TS_CACHE[1]
+
+
+def _utcnow_iso() -> str:
+    _refresh_ts()
+    return _TS_CACHE[2]
+
+
+# Response models that are never mutated after construction.
+_FROZEN = ConfigDict(frozen=True)
+
+# Deliberately loose address check — delivery is the real validation.
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -63,11 +98,18 @@ class DistributionType(str, Enum):
     EXPONENTIAL = "exponential"
 
 
+# value → member lookups for enums resolved from raw strings (AI output, query text)
+COSO_CATEGORY_BY_VALUE: Dict[str, COSOCategory] = {m.value: m for m in COSOCategory}
+DISTRIBUTION_BY_VALUE: Dict[str, DistributionType] = {m.value: m for m in DistributionType}
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # STOCK / MARKET DATA
 # ══════════════════════════════════════════════════════════════════════════════
 
 class StockQuote(BaseModel):
+    model_config = _FROZEN
+
     symbol: str
     company: str
     price: float
@@ -87,11 +129,13 @@ class StockQuote(BaseModel):
     eps: Optional[float] = None
     analyst_target: Optional[float] = None
     sector: Optional[str] = None
-    last_updated: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    last_updated: str = Field(default_factory=_utcnow_iso)
     data_source: str = "simulated"
 
 
 class PriceBar(BaseModel):
+    model_config = _FROZEN
+
     date: str
     open: float
     high: float
@@ -101,6 +145,8 @@ class PriceBar(BaseModel):
 
 
 class MarketIndex(BaseModel):
+    model_config = _FROZEN
+
     name: str
     symbol: str
     value: float
@@ -119,6 +165,8 @@ class StockHistoryRequest(BaseModel):
 
 
 class NewsItem(BaseModel):
+    model_config = _FROZEN
+
     title: str
     url: str
     source: str
@@ -141,7 +189,7 @@ class PortfolioPosition(BaseModel):
     avg_cost: float = Field(..., gt=0)
     note: Optional[str] = None
     sector: Optional[str] = None
-    added_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    added_at: str = Field(default_factory=_utcnow_iso)
 
 
 class AddPositionRequest(BaseModel):
@@ -150,7 +198,8 @@ class AddPositionRequest(BaseModel):
     avg_cost: float = Field(..., gt=0)
     note: Optional[str] = None
 
-    @validator("symbol")
+    @field_validator("symbol")
+    @classmethod
     def symbol_uppercase(cls, v: str) -> str:
         return v.upper().strip()
 
@@ -163,6 +212,8 @@ class UpdatePositionRequest(BaseModel):
 
 class EnrichedPosition(BaseModel):
     """Position enriched with live price data and computed analytics."""
+    model_config = _FROZEN
+
     id: str
     symbol: str
     company: str
@@ -248,6 +299,8 @@ class AlertConfig(BaseModel):
     send_daily_summary: bool = False
     daily_summary_time: str = "16:00"
     email_provider: EmailProvider = EmailProvider.SMTP
+    email_batch_max: int = 32                # emails per provider round-trip
+    email_batch_wait_seconds: float = 0.2    # max time to hold an email for batching
 
 
 class InAppAlert(BaseModel):
@@ -265,6 +318,8 @@ class InAppAlert(BaseModel):
 
 
 class AlertLogEntry(BaseModel):
+    model_config = _FROZEN
+
     id: str
     timestamp: datetime
     alert_type: AlertType
@@ -282,16 +337,19 @@ class SendTestAlertRequest(BaseModel):
     alert_type: AlertType = AlertType.SELL_TARGET_HIT
 
 
-class UpdateAlertConfigRequest(BaseModel):
-    user_email: Optional[str] = None
-    enabled: Optional[bool] = None
-    check_interval_seconds: Optional[int] = None
-    alert_on_sell_target: Optional[bool] = None
-    alert_on_stop_loss: Optional[bool] = None
-    alert_on_trailing_stop: Optional[bool] = None
-    alert_on_bull_target: Optional[bool] = None
-    send_daily_summary: Optional[bool] = None
-    email_provider: Optional[EmailProvider] = None
+class UpdateAlertConfigRequest(TypedDict, total=False):
+    """Partial AlertConfig update — only the keys the client sends are present."""
+    user_email: Optional[str]
+    enabled: Optional[bool]
+    check_interval_seconds: Optional[int]
+    alert_on_sell_target: Optional[bool]
+    alert_on_stop_loss: Optional[bool]
+    alert_on_trailing_stop: Optional[bool]
+    alert_on_bull_target: Optional[bool]
+    send_daily_summary: Optional[bool]
+    email_provider: Optional[EmailProvider]
+    email_batch_max: Optional[int]
+    email_batch_wait_seconds: Optional[float]
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -312,6 +370,8 @@ class VaRResult(BaseModel):
 
 
 class RiskContributor(BaseModel):
+    model_config = _FROZEN
+
     symbol: str
     company: str
     marginal_var: float
@@ -321,6 +381,8 @@ class RiskContributor(BaseModel):
 
 
 class StressTestResult(BaseModel):
+    model_config = _FROZEN
+
     scenario: str
     impact_pct: float
     impact_dollars: float
@@ -371,6 +433,8 @@ class RegimeClassification(BaseModel):
 # ══════════════════════════════════════════════════════════════════════════════
 
 class HedgeProposal(BaseModel):
+    model_config = _FROZEN
+
     id: str
     instrument: str
     instrument_type: str        # "Index Future" | "Put Option" | "ETF" | etc.
@@ -390,6 +454,8 @@ class HedgeProposal(BaseModel):
 # ══════════════════════════════════════════════════════════════════════════════
 
 class AuditEntry(BaseModel):
+    model_config = _FROZEN
+
     id: str
     timestamp: datetime
     event_type: str
@@ -407,6 +473,8 @@ class AuditEntry(BaseModel):
 # ══════════════════════════════════════════════════════════════════════════════
 
 class ServiceStatus(BaseModel):
+    model_config = _FROZEN
+
     name: str
     status: str                 # "operational" | "degraded" | "down"
     latency_ms: Optional[float] = None
@@ -430,6 +498,10 @@ class SystemHealthResponse(BaseModel):
 # ══════════════════════════════════════════════════════════════════════════════
 
 class TenKRiskFactor(BaseModel):
+    # Built in bulk via model_construct in the 10-K router; forbid catches
+    # typo'd fields anywhere it is still validated.
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     risk_id: str
     company_ticker: str
     filing_date: date
@@ -441,7 +513,7 @@ class TenKRiskFactor(BaseModel):
     impact: float = Field(ge=0.0, le=1.0, default=0.5)
     is_new_risk: bool = False
     watson_enhanced_text: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
 
 
 class TenKFiling(BaseModel):
@@ -462,6 +534,18 @@ class TenKAnalysisRequest(BaseModel):
     use_watson_enhancement: bool = True
 
 
+class TenKAnalysisResponse(BaseModel):
+    ticker: str
+    filing_date: date
+    fiscal_year: int
+    accession_number: str
+    document_url: str
+    risks_count: int
+    risks: List[TenKRiskFactor]
+    watson_enabled: bool
+    parsed_at: datetime
+
+
 class TenKComparisonRequest(BaseModel):
     ticker: str
     year1: int
@@ -479,6 +563,8 @@ class TenKComparisonResult(BaseModel):
 
 
 class HeatMapPoint(BaseModel):
+    model_config = _FROZEN
+
     risk_id: str
     x: float  # likelihood
     y: float  # impact
@@ -505,7 +591,8 @@ class VaRConfig(BaseModel):
     use_watson_recommendation: bool = True
 
 
-class VaRResult(BaseModel):
+class VaRPointResult(BaseModel):
+    """VaR/ES at a single confidence level and time horizon."""
     confidence_level: float
     time_horizon: int
     var_amount: float
@@ -516,8 +603,8 @@ class VaRResult(BaseModel):
 
 class MultiVaRResult(BaseModel):
     portfolio_id: str
-    calculation_time: datetime = Field(default_factory=datetime.utcnow)
-    results: List[VaRResult]
+    calculation_time: datetime = Field(default_factory=_utcnow)
+    results: List[VaRPointResult]
     distribution_recommendation: Optional[Dict[str, Any]] = None
     statistical_tests: Optional[Dict[str, Any]] = None
 
@@ -573,7 +660,15 @@ class BreachMonitorConfig(BaseModel):
     portfolio_id: str
     thresholds: List[BreachThreshold]
     notification_enabled: bool = True
-    notification_emails: List[EmailStr] = Field(default_factory=list)
+    notification_emails: List[str] = Field(default_factory=list)
+
+    @field_validator("notification_emails")
+    @classmethod
+    def emails_well_formed(cls, v: List[str]) -> List[str]:
+        bad = [e for e in v if not _EMAIL_RE.match(e)]
+        if bad:
+            raise ValueError(f"Invalid email address: {', '.join(bad)}")
+        return v
 
 
 class BreachHistory(BaseModel):
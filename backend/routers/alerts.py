@@ -12,8 +12,9 @@ DELETE /api/alerts/cooldown/{symbol}/{alert_type}
 GET    /api/alerts/status
 """
 
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import APIRouter, HTTPException, Path, Request, Response
 from typing import List
+import hashlib
 
 from models.schemas import (
     AlertConfig, InAppAlert, AlertLogEntry, AlertType,
@@ -24,26 +25,33 @@ from services.alert_agent import alert_agent
 router = APIRouter()
 
 
+def _not_modified(request: Request, response: Response, etag: str) -> bool:
+    """Set the ETag header and report whether the client's copy is current."""
+    response.headers["ETag"] = etag
+    return request.headers.get("if-none-match") == etag
+
+
 @router.get("/config", response_model=AlertConfig, summary="Get current alert configuration")
-async def get_config():
+async def get_config(request: Request, response: Response):
+    etag = f'"cfg-{alert_agent.config_version}"'
+    if _not_modified(request, response, etag):
+        return Response(status_code=304, headers={"ETag": etag})
     return alert_agent.config
 
 
 @router.put("/config", response_model=AlertConfig, summary="Update alert configuration")
 async def update_config(req: UpdateAlertConfigRequest):
-    updates = {k: v for k, v in req.dict().items() if v is not None}
-    return alert_agent.update_config(updates)
+    return alert_agent.update_config(req)
 
 
-@router.get("/in-app", response_model=List[dict], summary="List all in-app alerts")
+@router.get("/in-app", response_model=List[InAppAlert], summary="List all in-app alerts")
 async def list_in_app_alerts(unacknowledged_only: bool = False):
-    alerts = alert_agent.in_app_alerts
     if unacknowledged_only:
-        alerts = [a for a in alerts if not a.acknowledged]
-    return [a.dict() for a in alerts]
+        return alert_agent.unacknowledged_alerts
+    return alert_agent.in_app_alerts
 
 
-@router.post("/in-app/{alert_id}/acknowledge", response_model=dict, summary="Acknowledge an alert")
+@router.post("/in-app/{alert_id}/acknowledge", summary="Acknowledge an alert")
 async def acknowledge_alert(alert_id: str = Path(...)):
     success = alert_agent.acknowledge_alert(alert_id)
     if not success:
@@ -51,18 +59,18 @@ async def acknowledge_alert(alert_id: str = Path(...)):
     return {"acknowledged": alert_id}
 
 
-@router.delete("/in-app", response_model=dict, summary="Clear all in-app alerts")
+@router.delete("/in-app", summary="Clear all in-app alerts")
 async def clear_alerts():
     alert_agent.clear_all_alerts()
     return {"cleared": True}
 
 
-@router.get("/logs", response_model=List[dict], summary="Email alert logs")
+@router.get("/logs", response_model=List[AlertLogEntry], summary="Email alert logs")
 async def get_email_logs():
-    return [log.dict() for log in alert_agent.email_logs]
+    return alert_agent.email_logs
 
 
-@router.post("/test", response_model=dict, summary="Send a test alert")
+@router.post("/test", summary="Send a test alert")
 async def send_test_alert(req: SendTestAlertRequest):
     """Manually fire a test alert for any held symbol."""
     result = await alert_agent.send_test_alert(req.symbol, req.alert_type)
@@ -71,25 +79,36 @@ async def send_test_alert(req: SendTestAlertRequest):
             status_code=404,
             detail=f"Symbol {req.symbol} not found in monitored portfolio. Add it first."
         )
-    return {"sent": True, "alert": result.dict()}
+    return {"sent": True, "alert": result}
 
 
-@router.delete("/cooldown/{symbol}/{alert_type}", response_model=dict, summary="Reset alert cooldown")
+@router.delete("/cooldown/{symbol}/{alert_type}", summary="Reset alert cooldown")
 async def reset_cooldown(symbol: str, alert_type: AlertType):
     """Reset the 4-hour cooldown for a specific symbol + alert type combination."""
     alert_agent.reset_cooldown(symbol.upper(), alert_type)
     return {"reset": True, "symbol": symbol.upper(), "alert_type": alert_type}
 
 
-@router.get("/status", response_model=dict, summary="Alert agent status")
-async def get_status():
+@router.get("/status", summary="Alert agent status")
+async def get_status(request: Request, response: Response):
+    agent = alert_agent
+    cfg   = agent.config
+    symbols     = agent.monitored_symbols
+    unacked     = agent.unacknowledged_count
+    fired_today = agent.alerts_today
+
+    # Weak validator: uptime ticks on every call, so it is left out of the tag
+    state = (agent.status, agent.config_version, tuple(symbols), unacked, fired_today)
+    etag = 'W/"' + hashlib.blake2b(repr(state).encode(), digest_size=8).hexdigest() + '"'
+    if _not_modified(request, response, etag):
+        return Response(status_code=304, headers={"ETag": etag})
     return {
-        "status":             alert_agent.status,
-        "enabled":            alert_agent.config.enabled,
-        "user_email":         alert_agent.config.user_email,
-        "monitored_symbols":  [h["symbol"] for h in alert_agent.holdings],
-        "unacknowledged":     sum(1 for a in alert_agent.in_app_alerts if not a.acknowledged),
-        "alerts_today":       alert_agent.alerts_today,
-        "uptime_seconds":     alert_agent.uptime_seconds,
-        "check_interval_sec": alert_agent.config.check_interval_seconds,
+        "status":             agent.status,
+        "enabled":            cfg.enabled,
+        "user_email":         cfg.user_email,
+        "monitored_symbols":  symbols,
+        "unacknowledged":     unacked,
+        "alerts_today":       fired_today,
+        "uptime_seconds":     agent.uptime_seconds,
+        "check_interval_sec": cfg.check_interval_seconds,
     }
@@ -1,13 +1,30 @@
 """CLARA — Historical Analogs Router"""
+from functools import lru_cache
+
 from fastapi import APIRouter
+
+from routers.static import json_bytes, json_response
+
 router = APIRouter()
 
+_ANALOG_COLS = ("event", "date", "semantic_score", "structural_score", "market_score", "equity_shock", "credit_shock", "vol_shock", "duration_weeks")
+_ANALOG_ROWS = (
+    ("COVID-19 Market Crash", "Mar 2020", 0.87, 0.79, 0.91, -34.0, +380, +48.2, 5),
+    ("Fed Taper Tantrum",     "Jun 2013", 0.72, 0.81, 0.68, -7.5,  +95,  +11.3, 8),
+    ("2018 Rate Hike Cycle",  "Q4 2018",  0.69, 0.77, 0.73, -19.8, +145, +18.7, 12),
+    ("China Trade War",       "May 2019", 0.81, 0.74, 0.69, -6.8,  +62,  +8.4,  6),
+    ("Volmageddon",           "Feb 2018", 0.58, 0.62, 0.84, -10.2, +88,  +35.6, 3),
+)
+
+_CACHE_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+
+@lru_cache(maxsize=1)
+def _top_analogs_json() -> bytes:
+    """Static payload — built and serialized on first request, then served as raw bytes."""
+    return json_bytes([dict(zip(_ANALOG_COLS, row)) for row in _ANALOG_ROWS])
+
+
 @router.get("/top")
 async def top_analogs():
-    return [
-        {"event": "COVID-19 Market Crash", "date": "Mar 2020", "semantic_score": 0.87, "structural_score": 0.79, "market_score": 0.91, "equity_shock": -34.0, "credit_shock": +380, "vol_shock": +48.2, "duration_weeks": 5},
-        {"event": "Fed Taper Tantrum",     "date": "Jun 2013", "semantic_score": 0.72, "structural_score": 0.81, "market_score": 0.68, "equity_shock": -7.5,  "credit_shock": +95,  "vol_shock": +11.3, "duration_weeks": 8},
-        {"event": "2018 Rate Hike Cycle",  "date": "Q4 2018",  "semantic_score": 0.69, "structural_score": 0.77, "market_score": 0.73, "equity_shock": -19.8, "credit_shock": +145, "vol_shock": +18.7, "duration_weeks": 12},
-        {"event": "China Trade War",       "date": "May 2019", "semantic_score": 0.81, "structural_score": 0.74, "market_score": 0.69, "equity_shock": -6.8,  "credit_shock": +62,  "vol_shock": +8.4,  "duration_weeks": 6},
-        {"event": "Volmageddon",           "date": "Feb 2018", "semantic_score": 0.58, "structural_score": 0.62, "market_score": 0.84, "equity_shock": -10.2, "credit_shock": +88,  "vol_shock": +35.6, "duration_weeks": 3},
-    ]
+    return json_response(_top_analogs_json(), _CACHE_HEADERS)
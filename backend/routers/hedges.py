@@ -1,5 +1,6 @@
 """CLARA — Hedge Engine Router"""
 from fastapi import APIRouter
+from routers.static import json_bytes, json_response
 from services.ai_analysis_service import ai_analysis_service
 
 router = APIRouter()
@@ -13,9 +14,11 @@ HEDGE_PROPOSALS = [
     {"id": "h6", "instrument": "GLD Long",               "type": "ETF",        "symbol": "GLD", "notional": 600_000,   "cost": 2_400,  "cost_pct": 0.40, "effectiveness_pct": 45, "residual_tail": 0.55, "priority": "Medium",   "rationale": "Safe-haven diversifier in crisis regime"},
 ]
 
+_HEDGE_PROPOSALS_JSON = json_bytes(HEDGE_PROPOSALS)
+
 @router.get("/proposals")
-async def get_hedge_proposals():
-    return HEDGE_PROPOSALS
+def get_hedge_proposals():
+    return json_response(_HEDGE_PROPOSALS_JSON)
 
 
 @router.get("/analysis")
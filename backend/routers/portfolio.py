@@ -18,16 +18,22 @@ GET    /api/portfolio/stress-test
 POST   /api/portfolio/refresh-prices
 """
 
+import asyncio
+import time
 import uuid
 import logging
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional
 
-from fastapi import APIRouter, Body, HTTPException, Query
+import numpy as np
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 
+from config import MONTE_CARLO_PATHS
 from models.schemas import (
     AddPositionRequest, UpdatePositionRequest, PortfolioPosition,
     EnrichedPosition, PortfolioSummary, VaRResult, RiskContributor,
-    MonteCarloResult, BuyRecommendation
+    MonteCarloResult, BuyRecommendation, _utcnow_iso
 )
 from services import stock_data as sd
 from services.portfolio_engine import (
@@ -41,20 +47,96 @@ logger = logging.getLogger("CLARA.portfolio")
 router = APIRouter()
 
 # ── In-memory position store (replace with DB in production) ──────────────────
-_positions: Dict[str, PortfolioPosition] = {}
+@dataclass(slots=True)
+class _PositionRow:
+    """Stored position — same fields as PortfolioPosition, without per-access validation."""
+    id: str
+    symbol: str
+    company: str
+    shares: float
+    avg_cost: float
+    note: Optional[str] = None
+    sector: Optional[str] = None
+    added_at: str = field(default_factory=_utcnow_iso)
+
+    def to_model(self) -> PortfolioPosition:
+        return PortfolioPosition(
+            id=self.id, symbol=self.symbol, company=self.company,
+            shares=self.shares, avg_cost=self.avg_cost, note=self.note,
+            sector=self.sector, added_at=self.added_at,
+        )
+
+
+_COMPANY_META = sd.COMPANY_META   # bound once; add_position looks up sector/name per insert
+_positions: Dict[str, _PositionRow] = {}
+_by_symbol: Dict[str, str] = {}   # symbol → position id (symbols are unique; adds DCA-merge)
+_positions_version: int = 0   # bumped on every mutation; invalidates _snapshot()
 
 
-def _all_positions() -> List[PortfolioPosition]:
+def _all_positions() -> List[_PositionRow]:
     return list(_positions.values())
 
 
+def _touch() -> None:
+    global _positions_version
+    _positions_version += 1
+
+
+# ── Shared quote + enrichment snapshot ────────────────────────────────────────
+# A dashboard load hits several analytics endpoints at once; they all share one
+# quote fetch and enrichment pass for up to _SNAPSHOT_TTL seconds.
+class Snapshot(NamedTuple):
+    enriched: List[EnrichedPosition]
+    total_value: float
+    quotes: Dict[str, Dict[str, Any]]
+    enriched_dicts: List[Dict[str, Any]]   # dumped once; handed to the alert agent
+
+_SNAPSHOT_TTL = 2.0
+_snapshot_cache: Dict[str, Any] = {"version": -1, "at": 0.0, "task": None}
+_EMPTY_SNAPSHOT = Snapshot([], 0.0, {}, [])
+
+
+async def _build_snapshot(positions: List[_PositionRow], symbols: List[str]) -> Snapshot:
+    quotes  = await sd.get_quotes_batch(symbols)
+    n       = len(positions)
+    shares  = np.fromiter((p.shares for p in positions), dtype=np.float64, count=n)
+    prices  = np.fromiter(
+        (quotes.get(p.symbol, {}).get("price", p.avg_cost) for p in positions),
+        dtype=np.float64, count=n,
+    )
+    total_value = float(shares @ prices)
+    enriched = [enrich_position(p, quotes.get(p.symbol, {}), total_value) for p in positions]
+    return Snapshot(enriched, total_value, quotes, [e.model_dump() for e in enriched])
+
+
+async def _snapshot() -> Snapshot:
+    """
+    Return the current Snapshot, joining an in-flight fetch if one exists.
+    Used as a FastAPI dependency by the analytics endpoints.
+    """
+    if not _positions:
+        return _EMPTY_SNAPSHOT
+    cache = _snapshot_cache
+    task  = cache["task"]
+    now   = time.monotonic()
+    if task is None or cache["version"] != _positions_version or now - cache["at"] > _SNAPSHOT_TTL:
+        task = asyncio.ensure_future(_build_snapshot(_all_positions(), list(_by_symbol)))
+        cache.update(version=_positions_version, at=now, task=task)
+    try:
+        return await asyncio.shield(task)
+    except Exception:
+        if cache["task"] is task:
+            cache["task"] = None
+        raise
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # CRUD
 # ══════════════════════════════════════════════════════════════════════════════
 
 @router.get("/positions", response_model=List[PortfolioPosition], summary="List all positions")
 async def list_positions():
-    return _all_positions()
+    return [row.to_model() for row in _positions.values()]
 
 
 @router.post("/positions", response_model=PortfolioPosition, summary="Add a new position")
@@ -64,9 +146,10 @@ async def add_position(req: AddPositionRequest):
     If the symbol already exists, performs dollar-cost averaging (merges).
     """
     # Check for existing position with same symbol
-    existing = next((p for p in _positions.values() if p.symbol == req.symbol), None)
+    existing_id = _by_symbol.get(req.symbol)
 
-    if existing:
+    if existing_id is not None:
+        existing = _positions[existing_id]
         # Dollar-cost average merge
         old_cost_basis = existing.shares * existing.avg_cost
         new_cost_basis = req.shares * req.avg_cost
@@ -77,13 +160,14 @@ async def add_position(req: AddPositionRequest):
         existing.avg_cost = round(new_avg_cost, 4)
         if req.note:
             existing.note = req.note
+        _touch()
         logger.info("DCA merged %s: %s shares @ $%.2f avg", req.symbol, total_shares, new_avg_cost)
-        return existing
+        return existing.to_model()
 
     # Fetch metadata for sector
-    meta   = sd.COMPANY_META.get(req.symbol, {})
+    meta   = _COMPANY_META.get(req.symbol, {})
     pos_id = str(uuid.uuid4())
-    pos    = PortfolioPosition(
+    pos    = _PositionRow(
         id=pos_id,
         symbol=req.symbol,
         company=meta.get("name", req.symbol),
@@ -93,8 +177,10 @@ async def add_position(req: AddPositionRequest):
         sector=meta.get("sector"),
     )
     _positions[pos_id] = pos
+    _by_symbol[req.symbol] = pos_id
+    _touch()
     logger.info("Added position: %s %s shares @ $%.2f", req.symbol, req.shares, req.avg_cost)
-    return pos
+    return pos.to_model()
 
 
 @router.put("/positions/{position_id}", response_model=PortfolioPosition, summary="Update a position")
@@ -102,29 +188,30 @@ async def update_position(position_id: str, req: UpdatePositionRequest):
     if position_id not in _positions:
         raise HTTPException(status_code=404, detail="Position not found")
     pos = _positions[position_id]
-    if req.shares is not None:
-        pos.shares = req.shares
-    if req.avg_cost is not None:
-        pos.avg_cost = req.avg_cost
-    if req.note is not None:
-        pos.note = req.note
-    return pos
+    for key, val in req.model_dump(exclude_unset=True).items():
+        if val is not None:
+            setattr(pos, key, val)
+    _touch()
+    return pos.to_model()
 
 
-@router.delete("/positions/{position_id}", response_model=dict, summary="Delete a position")
+@router.delete("/positions/{position_id}", summary="Delete a position")
 async def delete_position(position_id: str):
     if position_id not in _positions:
         raise HTTPException(status_code=404, detail="Position not found")
-    sym = _positions[position_id].symbol
-    del _positions[position_id]
+    sym = _positions.pop(position_id).symbol
+    _by_symbol.pop(sym, None)
+    _touch()
     logger.info("Deleted position: %s", sym)
     return {"deleted": position_id, "symbol": sym}
 
 
-@router.delete("/positions", response_model=dict, summary="Clear entire portfolio")
+@router.delete("/positions", summary="Clear entire portfolio")
 async def clear_portfolio():
     count = len(_positions)
     _positions.clear()
+    _by_symbol.clear()
+    _touch()
     logger.info("Portfolio cleared (%d positions removed)", count)
     return {"cleared": count}
 
@@ -133,192 +220,162 @@ async def clear_portfolio():
 # ANALYTICS
 # ══════════════════════════════════════════════════════════════════════════════
 
-@router.get("/enriched", response_model=List[dict], summary="Positions with live prices + analytics")
-async def get_enriched_positions():
+@router.get("/enriched", response_model=List[EnrichedPosition], summary="Positions with live prices + analytics")
+async def get_enriched_positions(
+    background_tasks: BackgroundTasks,
+    snap: Snapshot = Depends(_snapshot),
+):
     """
     Returns all positions enriched with live prices, P&L, price targets, risk level.
     Automatically registers positions with the alert agent.
     """
-    positions = _all_positions()
-    if not positions:
+    if not snap.enriched:
         return []
 
-    symbols = list({p.symbol for p in positions})
-    quotes  = await sd.get_quotes_batch(symbols)
-
-    total_value = sum(
-        (p.shares * quotes.get(p.symbol, {}).get("price", p.avg_cost))
-        for p in positions
-    )
-
-    enriched = [
-        enrich_position(p, quotes.get(p.symbol, {}), total_value)
-        for p in positions
-    ]
-
-    # Register with alert agent for monitoring
-    alert_agent.register_holdings([e.dict() for e in enriched])
+    # Register with alert agent for monitoring once the response is sent. The
+    # agent writes live prices into its holdings, so hand it copies rather than
+    # the rows the snapshot cache keeps serving.
+    background_tasks.add_task(alert_agent.register_holdings, [dict(d) for d in snap.enriched_dicts])
 
-    return [e.dict() for e in enriched]
+    # The snapshot already holds the dumped rows; skip response_model re-validation.
+    return ORJSONResponse(snap.enriched_dicts)
 
 
-@router.get("/summary", response_model=dict, summary="Portfolio summary KPIs")
-async def get_summary():
+@router.get("/summary", response_model=PortfolioSummary, summary="Portfolio summary KPIs")
+async def get_summary(snap: Snapshot = Depends(_snapshot)):
     """Aggregate portfolio metrics: total value, P&L, beta, VaR."""
-    positions = _all_positions()
-    if not positions:
+    if not snap.enriched:
         return PortfolioSummary(
             total_value=0, cost_basis=0, total_gain_loss=0,
             total_gain_loss_pct=0, day_gain_loss=0, portfolio_beta=0,
             positions_count=0, var_1d_95=0, expected_shortfall=0,
-        ).dict()
-
-    symbols = list({p.symbol for p in positions})
-    quotes  = await sd.get_quotes_batch(symbols)
-    total_value = sum(
-        p.shares * quotes.get(p.symbol, {}).get("price", p.avg_cost)
-        for p in positions
-    )
-    enriched = [enrich_position(p, quotes.get(p.symbol, {}), total_value) for p in positions]
-    return compute_portfolio_summary(enriched).dict()
+        )
+    return compute_portfolio_summary(snap.enriched)
 
 
-@router.get("/var", response_model=dict, summary="VaR and Expected Shortfall")
-async def get_var():
+@router.get("/var", response_model=VaRResult, summary="VaR and Expected Shortfall")
+async def get_var(snap: Snapshot = Depends(_snapshot)):
     """Compute parametric VaR (95/99) and Expected Shortfall."""
-    positions = _all_positions()
-    if not positions:
+    if not snap.enriched:
         raise HTTPException(status_code=400, detail="No positions in portfolio")
-    symbols = list({p.symbol for p in positions})
-    quotes  = await sd.get_quotes_batch(symbols)
-    total_value = sum(
-        p.shares * quotes.get(p.symbol, {}).get("price", p.avg_cost)
-        for p in positions
-    )
-    enriched = [enrich_position(p, quotes.get(p.symbol, {}), total_value) for p in positions]
-    return compute_var(enriched).dict()
+    return await asyncio.to_thread(compute_var, snap.enriched)
 
 
-@router.get("/contributors", response_model=List[dict], summary="Top marginal VaR contributors")
-async def get_risk_contributors():
+@router.get("/contributors", response_model=List[RiskContributor], summary="Top marginal VaR contributors")
+async def get_risk_contributors(snap: Snapshot = Depends(_snapshot)):
     """Rank positions by their marginal contribution to portfolio VaR."""
-    positions = _all_positions()
-    if not positions:
+    if not snap.enriched:
         return []
-    symbols = list({p.symbol for p in positions})
-    quotes  = await sd.get_quotes_batch(symbols)
-    total_value = sum(
-        p.shares * quotes.get(p.symbol, {}).get("price", p.avg_cost)
-        for p in positions
-    )
-    enriched  = [enrich_position(p, quotes.get(p.symbol, {}), total_value) for p in positions]
-    contribs  = compute_risk_contributors(enriched)
-    return [c.dict() for c in contribs]
+    return await asyncio.to_thread(compute_risk_contributors, snap.enriched)
 
 
-@router.get("/monte-carlo", response_model=dict, summary="Monte Carlo simulation")
-async def get_monte_carlo(paths: int = Query(10_000, ge=1_000, le=100_000)):
+@router.get("/monte-carlo", response_model=MonteCarloResult, summary="Monte Carlo simulation")
+async def get_monte_carlo(
+    paths: int = Query(MONTE_CARLO_PATHS, ge=1_000, le=100_000),
+    snap: Snapshot = Depends(_snapshot),
+):
     """Run Monte Carlo simulation for portfolio P&L distribution."""
-    positions = _all_positions()
-    if not positions:
+    if not snap.enriched:
         raise HTTPException(status_code=400, detail="No positions in portfolio")
-    symbols = list({p.symbol for p in positions})
-    quotes  = await sd.get_quotes_batch(symbols)
-    total_value = sum(
-        p.shares * quotes.get(p.symbol, {}).get("price", p.avg_cost)
-        for p in positions
-    )
-    enriched = [enrich_position(p, quotes.get(p.symbol, {}), total_value) for p in positions]
-    result   = run_monte_carlo(enriched, n_paths=paths)
-    return result.dict()
+    return await asyncio.to_thread(run_monte_carlo, snap.enriched, paths)
 
 
-@router.get("/buy-recommendations", response_model=List[dict], summary="AI buy recommendations")
+@router.get("/buy-recommendations", response_model=List[BuyRecommendation], summary="AI buy recommendations")
 async def get_buy_recommendations_endpoint():
     """AI-curated buy recommendations with price targets, thesis, and risk analysis."""
     existing = [p.symbol for p in _all_positions()]
     symbols  = ["NVDA", "AVGO", "META", "GOOGL", "LLY", "V", "MSFT", "COST"]
     quotes   = await sd.get_quotes_batch(symbols)
-    recs     = await get_buy_recommendations(existing, quotes)
-    return [r.dict() for r in recs]
+    return await get_buy_recommendations(existing, quotes)
+
+
+_STRESS_SCENARIOS = (
+    ("Market Crash -20%",             -0.20),
+    ("Tech Selloff -30%",             -0.30),
+    ("Mild Correction -10%",          -0.10),
+    ("Fed Rate Shock -15%",           -0.15),
+    ("Geopolitical Crisis -25%",      -0.25),
+    ("Soft Landing Rally +15%",       +0.15),
+    ("AI Boom +40%",                  +0.40),
+    ("Stagflation Scenario -18%",     -0.18),
+)
+_STRESS_SHOCKS = np.array([shock for _, shock in _STRESS_SCENARIOS], dtype=np.float64)
+# Value-independent columns: (scenario, shock_pct, impact_pct)
+_STRESS_ROWS = tuple((name, shock * 100, round(shock * 100, 1)) for name, shock in _STRESS_SCENARIOS)
 
 
-@router.get("/stress-test", response_model=List[dict], summary="Scenario stress tests")
-async def get_stress_test():
+@router.get("/stress-test", summary="Scenario stress tests")
+async def get_stress_test(snap: Snapshot = Depends(_snapshot)):
     """Run predefined stress scenarios against the portfolio."""
-    positions = _all_positions()
-    if not positions:
+    if not snap.enriched:
         return []
 
-    symbols = list({p.symbol for p in positions})
-    quotes  = await sd.get_quotes_batch(symbols)
-    total_value = sum(
-        p.shares * quotes.get(p.symbol, {}).get("price", p.avg_cost)
-        for p in positions
-    )
-
-    scenarios = [
-        {"name": "Market Crash -20%",             "shock": -0.20},
-        {"name": "Tech Selloff -30%",             "shock": -0.30},
-        {"name": "Mild Correction -10%",          "shock": -0.10},
-        {"name": "Fed Rate Shock -15%",           "shock": -0.15},
-        {"name": "Geopolitical Crisis -25%",      "shock": -0.25},
-        {"name": "Soft Landing Rally +15%",       "shock": +0.15},
-        {"name": "AI Boom +40%",                  "shock": +0.40},
-        {"name": "Stagflation Scenario -18%",     "shock": -0.18},
+    total_value = snap.total_value
+
+    impacts  = total_value * _STRESS_SHOCKS
+    breaches = np.abs(impacts) > total_value * 0.10   # 10% drawdown limit
+    impact_dollars = np.round(impacts, 2).tolist()
+    var_changes    = np.round(np.abs(impacts) * 0.15, 2).tolist()
+    post_values    = np.round(total_value + impacts, 2).tolist()
+
+    return [
+        {
+            "scenario":       name,
+            "shock_pct":      shock_pct,
+            "impact_dollars": dollars,
+            "impact_pct":     impact_pct,
+            "var_change":     var_change,
+            "breach":         breach,
+            "post_value":     post_value,
+        }
+        for (name, shock_pct, impact_pct), dollars, var_change, breach, post_value
+        in zip(_STRESS_ROWS, impact_dollars, var_changes, breaches.tolist(), post_values)
     ]
 
-    results = []
-    limit   = total_value * 0.10   # 10% drawdown limit
 
-    for s in scenarios:
-        impact_dollars = total_value * s["shock"]
-        results.append({
-            "scenario":       s["name"],
-            "shock_pct":      s["shock"] * 100,
-            "impact_dollars": round(impact_dollars, 2),
-            "impact_pct":     round(s["shock"] * 100, 1),
-            "var_change":     round(abs(impact_dollars) * 0.15, 2),
-            "breach":         abs(impact_dollars) > limit,
-            "post_value":     round(total_value + impact_dollars, 2),
-        })
+# In-flight refreshes keyed by symbol set; a burst of clicks joins the running
+# fan-out instead of hitting the providers again.
+_refreshes: Dict[frozenset, asyncio.Task] = {}
+
 
-    return results
+def _refresh_done(key: frozenset, task: asyncio.Task) -> None:
+    _refreshes.pop(key, None)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Price refresh failed: %s", task.exception())
 
 
-@router.post("/refresh-prices", response_model=dict, summary="Force refresh all position prices")
+@router.post("/refresh-prices", summary="Force refresh all position prices")
 async def refresh_prices():
-    """Manually trigger a live price refresh for all held symbols."""
-    positions = _all_positions()
-    if not positions:
+    """Queue a live price refresh for all held symbols and return immediately."""
+    if not _positions:
         return {"refreshed": 0}
-    symbols = list({p.symbol for p in positions})
-    quotes  = await sd.get_quotes_batch(symbols)
+    symbols = list(_by_symbol)
+    key     = frozenset(symbols)
+    task    = _refreshes.get(key)
+    joined  = task is not None
+    if not joined:
+        task = asyncio.create_task(sd.get_quotes_batch(symbols))
+        _refreshes[key] = task
+        task.add_done_callback(lambda t: _refresh_done(key, t))
     return {
         "refreshed": len(symbols),
         "symbols":   symbols,
-        "sources":   {sym: q.get("data_source", "unknown") for sym, q in quotes.items()},
+        "queued":    True,
+        "in_flight": joined,
     }
 
 
-@router.post("/analysis-summary", response_model=dict, summary="AI portfolio analysis summary")
+@router.post("/analysis-summary", summary="AI portfolio analysis summary")
 async def get_portfolio_analysis_summary(payload: Optional[Dict[str, Any]] = Body(default=None)):
     """
     AI-generated portfolio analysis with confidence gating.
     Accepts optional client payload; if omitted, computes from in-memory portfolio.
     """
     if payload is None:
-        positions = _all_positions()
-        if not positions:
+        if not _positions:
             raise HTTPException(status_code=400, detail="No positions in portfolio")
 
-        symbols = list({p.symbol for p in positions})
-        quotes = await sd.get_quotes_batch(symbols)
-        total_value = sum(
-            p.shares * quotes.get(p.symbol, {}).get("price", p.avg_cost)
-            for p in positions
-        )
-        enriched = [enrich_position(p, quotes.get(p.symbol, {}), total_value) for p in positions]
+        enriched = (await _snapshot()).enriched
         summary = compute_portfolio_summary(enriched)
 
         sorted_positions = sorted(enriched, key=lambda p: p.market_value, reverse=True)
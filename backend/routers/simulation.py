@@ -1,11 +1,13 @@
 """CLARA — Simulation Router"""
+import asyncio
 from fastapi import APIRouter, Query
+from config import MONTE_CARLO_PATHS
 from services.portfolio_engine import run_monte_carlo
-from models.schemas import EnrichedPosition, RiskLevel
+from models.schemas import EnrichedPosition, MonteCarloResult, RiskLevel
 router = APIRouter()
 
-@router.get("/run")
-async def run_simulation(paths: int = Query(10_000, ge=1000, le=100_000)):
+@router.get("/run", response_model=MonteCarloResult)
+async def run_simulation(paths: int = Query(MONTE_CARLO_PATHS, ge=1000, le=100_000)):
     """Run a standalone Monte Carlo simulation (demo data if no portfolio)."""
     demo = [
         EnrichedPosition(
@@ -18,4 +20,4 @@ async def run_simulation(paths: int = Query(10_000, ge=1000, le=100_000)):
             action="Hold", weight=100.0, data_source="simulated",
         )
     ]
-    return run_monte_carlo(demo, n_paths=paths).dict()
+    return await asyncio.to_thread(run_monte_carlo, demo, paths)
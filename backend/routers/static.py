@@ -0,0 +1,17 @@
+"""CLARA — Helpers for routers that serve constant JSON payloads"""
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+
+try:
+    import orjson
+    json_bytes = orjson.dumps
+except ImportError:  # pragma: no cover - orjson is optional
+    import json
+    def json_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(body: bytes, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """Wrap pre-serialized JSON bytes without re-validating or re-encoding them."""
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -12,7 +12,7 @@ router = APIRouter()
 
 
 @router.get("/")
-async def get_system_health():
+def get_system_health():
     """Get overall system health metrics."""
     return {
         "status": "operational",
@@ -30,6 +30,6 @@ async def get_system_health():
 
 
 @router.get("/ping")
-async def ping():
+def ping():
     """Simple ping endpoint for health checks."""
     return {"status": "ok", "timestamp": datetime.utcnow().isoformat()}
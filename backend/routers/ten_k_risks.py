@@ -3,18 +3,25 @@ Clara — 10-K Risk Analysis Router
 API endpoints for SEC 10-K filing analysis and risk extraction.
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import logging
 from datetime import datetime
+import asyncio
+import gzip
 import hashlib
+import time
+from collections import OrderedDict
+
+import numpy as np
 
 from models.schemas import (
     TenKAnalysisRequest,
+    TenKAnalysisResponse,
     TenKComparisonRequest,
     TenKRiskFactor,
     TenKComparisonResult,
-    HeatMapData
+    HeatMapData,
 )
 from services.sec_edgar_service import sec_edgar_service
 from services.watsonx_service import watsonx_service
@@ -24,12 +31,224 @@ from services.risk_heatmap_service import risk_heatmap_service
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# In-memory cache for parsed filings (in production, use Redis or database)
-_filing_cache: dict = {}
+# In-memory LRU cache for parsed filings (in production, use Redis or database).
+# Entries older than the TTL count as misses.
+_FILING_CACHE_SIZE = 512
+_FILING_CACHE_TTL_SECONDS = 24 * 3600
+
+
+class _CachedAnalysis(NamedTuple):
+    stored_at: float
+    result: TenKAnalysisResponse
+    json: bytes         # JSON body for clients that don't accept gzip
+    gzip_json: bytes    # same body gzip'd; sent as-is when accepted
+    # Column views over result.risks (same order) for the filter endpoints
+    severity: np.ndarray                 # likelihood × impact
+    coso_sets: Tuple[frozenset, ...]     # all COSO classifications per risk
+    primary_coso: Tuple[str, ...]        # heat-map category per risk
+
+
+def _build_entry(result: TenKAnalysisResponse) -> _CachedAnalysis:
+    risks = result.risks
+    n = len(risks)
+    body = result.model_dump_json().encode()
+    return _CachedAnalysis(
+        stored_at=time.monotonic(),
+        result=result,
+        json=body,
+        # Level 1: most of the ratio on risk-text-heavy JSON at a fraction of the CPU
+        gzip_json=gzip.compress(body, compresslevel=1),
+        severity=(
+            np.fromiter((r.likelihood for r in risks), dtype=np.float64, count=n)
+            * np.fromiter((r.impact for r in risks), dtype=np.float64, count=n)
+        ),
+        coso_sets=tuple(frozenset(r.coso_classifications) for r in risks),
+        primary_coso=tuple(
+            r.coso_classifications[0] if r.coso_classifications else "operational" for r in risks
+        ),
+    )
+
+
+_filing_cache: "OrderedDict[str, _CachedAnalysis]" = OrderedDict()
+
+# Analyses currently running, keyed like _filing_cache
+_inflight: Dict[str, asyncio.Future] = {}
+
+# min_severity query value → minimum likelihood × impact score
+_MIN_SEVERITY_SCORE = {'low': 0.33, 'medium': 0.67, 'high': 1.0}
+
+# Caps concurrent COSO classifications (Watson calls) across all requests
+_COSO_SEMAPHORE = asyncio.Semaphore(8)
+
+
+async def _classify_coso(risk_text: str, use_watson: bool) -> List[str]:
+    async with _COSO_SEMAPHORE:
+        return await coso_classifier.classify_risk(risk_text, use_watson=use_watson)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """True if an Accept-Encoding header allows gzip (honours q-values and *)."""
+    wildcard = False
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "x-gzip", "*"):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == "*":
+            wildcard = q > 0
+        else:
+            return q > 0
+    return wildcard
+
+
+def _cache_entry(cache_key: str) -> Optional[_CachedAnalysis]:
+    entry = _filing_cache.get(cache_key)
+    if entry is None:
+        return None
+    if time.monotonic() - entry.stored_at > _FILING_CACHE_TTL_SECONDS:
+        del _filing_cache[cache_key]
+        return None
+    _filing_cache.move_to_end(cache_key)
+    return entry
+
+
+def _analysis_done(cache_key: str, task: asyncio.Future) -> None:
+    _inflight.pop(cache_key, None)
+    if task.cancelled() or task.exception() is not None:
+        return
+    _filing_cache[cache_key] = _build_entry(task.result())
+    _filing_cache.move_to_end(cache_key)
+    while len(_filing_cache) > _FILING_CACHE_SIZE:
+        _filing_cache.popitem(last=False)
+
+
+async def _run_analysis(request: TenKAnalysisRequest, ticker: str) -> TenKAnalysisResponse:
+    """Fetch, parse and classify one 10-K; see analyze_10k for the steps."""
+    # Fetch 10-K filing
+    logger.info(f"Fetching 10-K for {ticker}" + (f" year {request.year}" if request.year else ""))
+    filing = await sec_edgar_service.fetch_10k_filing(ticker, request.year)
+
+    if not filing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"10-K filing not found for {ticker}" + (f" in {request.year}" if request.year else "")
+        )
+
+    # Download HTML
+    logger.info(f"Downloading 10-K HTML for {ticker}")
+    html = await sec_edgar_service.download_filing_html(filing)
+
+    if not html:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to download 10-K filing HTML"
+        )
+
+    # Parse Item 1A
+    logger.info(f"Parsing Item 1A for {ticker}, HTML length: {len(html)}")
+    item_1a_text = await sec_edgar_service.parse_risk_factors(html)
+
+    if not item_1a_text:
+        logger.error(f"Failed to parse Item 1A from 10-K filing for {ticker}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to parse Item 1A from 10-K filing"
+        )
+
+    logger.info(f"Item 1A text length: {len(item_1a_text)}")
+
+    # Extract risk paragraphs
+    # Regex-heavy over ~50-200 KB of text; keep it off the event loop
+    risk_paragraphs = await asyncio.to_thread(sec_edgar_service.extract_risk_paragraphs, item_1a_text)
+    logger.info(f"Extracted {len(risk_paragraphs)} risk paragraphs")
+
+    # Use Watson AI to generate additional risks (if enabled)
+    watson_risks = []
+    if request.use_watson_enhancement and watsonx_service.enabled:
+        logger.info("Generating enhanced risks with Watson AI")
+        watson_risks = await watsonx_service.generate_risks_from_10k(
+            item_1a_text, 
+            ticker
+        )
+
+    # Combine extracted and Watson-generated risks
+    all_risk_texts = risk_paragraphs[:20] + watson_risks  # Limit to 20 extracted + Watson risks
+
+    # Classify every risk with COSO concurrently
+    coso_results = await asyncio.gather(*(
+        _classify_coso(risk_text, request.use_watson_enhancement)
+        for risk_text in all_risk_texts
+    ))
+
+    # Create TenKRiskFactor objects (per-filing values hoisted out of the loop).
+    # Every value below is produced here with the right type, so model_construct
+    # skips validation; the models are frozen and section_ref is never mutated,
+    # so one dict serves every risk.
+    risk_factors = []
+    append       = risk_factors.append
+    filing_date  = filing.filing_date
+    fiscal_year  = filing.fiscal_year
+    section_ref  = {"item": "1A", "accession": filing.accession_number}
+    n_extracted  = len(risk_paragraphs)
+    # Likelihood/impact for every risk in one batch: (N, 2) rows
+    estimates    = risk_heatmap_service.estimate_likelihood_impact_batch(all_risk_texts).tolist()
+    # Hash state pre-fed with the constant ticker/year prefix; copied per risk
+    id_base = hashlib.blake2b(f"{ticker}_{fiscal_year}_".encode(), digest_size=8)
+    for i, (risk_text, coso_categories) in enumerate(zip(all_risk_texts, coso_results)):
+        # Generate risk ID (8-byte digest → 16 hex chars, no truncation)
+        h = id_base.copy()
+        h.update(f"{i}_{risk_text[:50]}".encode())
+
+        likelihood, impact = estimates[i]
 
+        append(TenKRiskFactor.model_construct(
+            risk_id=h.hexdigest(),
+            company_ticker=ticker,
+            filing_date=filing_date,
+            fiscal_year=fiscal_year,
+            risk_text=risk_text,
+            section_reference=section_ref,
+            coso_classifications=coso_categories,
+            likelihood=likelihood,
+            impact=impact,
+            is_new_risk=(i >= n_extracted),  # Watson-generated risks marked as new
+            watson_enhanced_text=None
+        ))
 
-@router.post("/analyze")
-async def analyze_10k(request: TenKAnalysisRequest):
+    # Prepare response (risks stay as models; serialized once on the way out)
+    return TenKAnalysisResponse(
+        ticker=ticker,
+        filing_date=filing_date,
+        fiscal_year=fiscal_year,
+        accession_number=filing.accession_number,
+        document_url=filing.document_url,
+        risks_count=len(risk_factors),
+        risks=risk_factors,
+        watson_enabled=watsonx_service.enabled and request.use_watson_enhancement,
+        parsed_at=datetime.utcnow(),
+    )
+
+
+async def _analysis_entry(ticker: str, year: Optional[int]) -> Optional[_CachedAnalysis]:
+    """Cached analysis for ticker/year, running (or joining) one on a miss."""
+    cache_key = f"{ticker}_{year or 'latest'}"
+    entry = _cache_entry(cache_key)
+    if entry is None:
+        await analyze_10k(TenKAnalysisRequest(ticker=ticker, year=year))
+        entry = _cache_entry(cache_key)
+    return entry
+
+
+@router.post("/analyze", response_model=TenKAnalysisResponse)
+async def analyze_10k(request: TenKAnalysisRequest, http_request: Request = None):
     """
     Fetch and analyze a 10-K filing for a company.
     
@@ -42,116 +261,38 @@ async def analyze_10k(request: TenKAnalysisRequest):
     6. Calculate likelihood and impact
     
     Returns:
-        Dictionary with filing metadata and extracted risks
+        Filing metadata and extracted risks
     """
     try:
         ticker = request.ticker.upper()
         
         # Check cache first
         cache_key = f"{ticker}_{request.year or 'latest'}"
-        if cache_key in _filing_cache:
+        cached = _cache_entry(cache_key)
+        if cached is not None:
             logger.info(f"Returning cached 10-K analysis for {cache_key}")
-            return _filing_cache[cache_key]
-        
-        # Fetch 10-K filing
-        logger.info(f"Fetching 10-K for {ticker}" + (f" year {request.year}" if request.year else ""))
-        filing = await sec_edgar_service.fetch_10k_filing(ticker, request.year)
-        
-        if not filing:
-            raise HTTPException(
-                status_code=404,
-                detail=f"10-K filing not found for {ticker}" + (f" in {request.year}" if request.year else "")
-            )
-        
-        # Download HTML
-        logger.info(f"Downloading 10-K HTML for {ticker}")
-        html = await sec_edgar_service.download_filing_html(filing)
-        
-        if not html:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to download 10-K filing HTML"
-            )
-        
-        # Parse Item 1A
-        logger.info(f"Parsing Item 1A for {ticker}, HTML length: {len(html)}")
-        item_1a_text = await sec_edgar_service.parse_risk_factors(html)
-        
-        if not item_1a_text:
-            logger.error(f"Failed to parse Item 1A from 10-K filing for {ticker}")
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to parse Item 1A from 10-K filing"
-            )
-        
-        logger.info(f"Item 1A text length: {len(item_1a_text)}")
-        
-        # Extract risk paragraphs
-        risk_paragraphs = sec_edgar_service.extract_risk_paragraphs(item_1a_text)
-        logger.info(f"Extracted {len(risk_paragraphs)} risk paragraphs")
-        
-        # Use Watson AI to generate additional risks (if enabled)
-        watson_risks = []
-        if request.use_watson_enhancement and watsonx_service.enabled:
-            logger.info("Generating enhanced risks with Watson AI")
-            watson_risks = await watsonx_service.generate_risks_from_10k(
-                item_1a_text, 
-                ticker
+            if http_request is None:
+                return cached.result
+            # Serve the stored JSON bytes; no response_model pass or re-encode
+            if _accepts_gzip(http_request.headers.get("accept-encoding", "")):
+                return Response(
+                    content=cached.gzip_json,
+                    media_type="application/json",
+                    headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+                )
+            return Response(
+                content=cached.json,
+                media_type="application/json",
+                headers={"Vary": "Accept-Encoding"},
             )
         
-        # Combine extracted and Watson-generated risks
-        all_risk_texts = risk_paragraphs[:20] + watson_risks  # Limit to 20 extracted + Watson risks
-        
-        # Create TenKRiskFactor objects
-        risk_factors = []
-        for i, risk_text in enumerate(all_risk_texts):
-            # Generate risk ID
-            risk_id = hashlib.md5(
-                f"{ticker}_{filing.fiscal_year}_{i}_{risk_text[:50]}".encode()
-            ).hexdigest()[:16]
-            
-            # Classify with COSO
-            coso_categories = await coso_classifier.classify_risk(
-                risk_text,
-                use_watson=request.use_watson_enhancement
-            )
-            
-            # Estimate likelihood and impact
-            likelihood, impact = risk_heatmap_service.estimate_likelihood_impact(risk_text)
-            
-            # Create risk factor
-            risk_factor = TenKRiskFactor(
-                risk_id=risk_id,
-                company_ticker=ticker,
-                filing_date=filing.filing_date,
-                fiscal_year=filing.fiscal_year,
-                risk_text=risk_text,
-                section_reference={"item": "1A", "accession": filing.accession_number},
-                coso_classifications=coso_categories,
-                likelihood=likelihood,
-                impact=impact,
-                is_new_risk=(i >= len(risk_paragraphs)),  # Watson-generated risks marked as new
-                watson_enhanced_text=None
-            )
-            risk_factors.append(risk_factor)
-        
-        # Prepare response
-        result = {
-            "ticker": ticker,
-            "filing_date": filing.filing_date.isoformat(),
-            "fiscal_year": filing.fiscal_year,
-            "accession_number": filing.accession_number,
-            "document_url": filing.document_url,
-            "risks_count": len(risk_factors),
-            "risks": [risk.model_dump() for risk in risk_factors],
-            "watson_enabled": watsonx_service.enabled and request.use_watson_enhancement,
-            "parsed_at": datetime.utcnow().isoformat()
-        }
-        
-        # Cache result
-        _filing_cache[cache_key] = result
-        
-        return result
+        # Share one in-flight analysis between concurrent callers for the same key
+        task = _inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(_run_analysis(request, ticker))
+            _inflight[cache_key] = task
+            task.add_done_callback(lambda t: _analysis_done(cache_key, t))
+        return await asyncio.shield(task)
         
     except HTTPException:
         raise
@@ -174,35 +315,30 @@ async def get_risks(
     """
     try:
         ticker = ticker.upper()
-        cache_key = f"{ticker}_{year or 'latest'}"
-        
-        # Check if analysis exists in cache
-        if cache_key not in _filing_cache:
-            # Trigger analysis
-            request = TenKAnalysisRequest(ticker=ticker, year=year)
-            await analyze_10k(request)
-        
-        result = _filing_cache.get(cache_key)
-        if not result:
+        entry = await _analysis_entry(ticker, year)
+        if entry is None:
             raise HTTPException(status_code=404, detail="No analysis found")
         
-        risks = [TenKRiskFactor(**risk) for risk in result['risks']]
-        
-        # Apply filters
+        # Filter with masks over the cached columns
+        risks = entry.result.risks
+        mask = np.ones(len(risks), dtype=bool)
         if coso_category:
-            risks = [r for r in risks if coso_category.lower() in r.coso_classifications]
+            category = coso_category.lower()
+            mask &= np.fromiter((category in cats for cats in entry.coso_sets), dtype=bool, count=len(risks))
         
         if min_severity:
             # Filter by severity based on likelihood × impact
-            severity_map = {'low': 0.33, 'medium': 0.67, 'high': 1.0}
-            min_score = severity_map.get(min_severity.lower(), 0.0)
-            risks = [r for r in risks if (r.likelihood * r.impact) >= min_score]
+            min_score = _MIN_SEVERITY_SCORE.get(min_severity.lower(), 0.0)
+            mask &= entry.severity >= min_score
+        
+        if not mask.all():
+            risks = [risks[i] for i in np.flatnonzero(mask)]
         
         return {
             "ticker": ticker,
-            "fiscal_year": result['fiscal_year'],
+            "fiscal_year": entry.result.fiscal_year,
             "risks_count": len(risks),
-            "risks": [risk.model_dump() for risk in risks]
+            "risks": risks
         }
         
     except HTTPException:
@@ -250,27 +386,23 @@ async def get_heat_map(
     """
     try:
         ticker = ticker.upper()
-        cache_key = f"{ticker}_{year or 'latest'}"
         
         # Ensure analysis exists
-        if cache_key not in _filing_cache:
-            request = TenKAnalysisRequest(ticker=ticker, year=year)
-            await analyze_10k(request)
-        
-        result = _filing_cache.get(cache_key)
-        if not result:
+        entry = await _analysis_entry(ticker, year)
+        if entry is None:
             raise HTTPException(status_code=404, detail="No analysis found")
         
-        # Convert to TenKRiskFactor objects
-        risks = [TenKRiskFactor(**risk) for risk in result['risks']]
+        # Apply COSO filter (on each risk's primary category) before plotting
+        risks = entry.result.risks
+        if coso_categories:
+            categories = frozenset(cat.strip().lower() for cat in coso_categories.split(','))
+            risks = [risk for risk, cat in zip(risks, entry.primary_coso) if cat in categories]
         
         # Generate heat map
-        heat_map = risk_heatmap_service.generate_heat_map(risks, auto_estimate=True)
-        
-        # Apply COSO filter if specified
-        if coso_categories:
-            categories = [cat.strip().lower() for cat in coso_categories.split(',')]
-            heat_map = risk_heatmap_service.filter_by_coso(heat_map, categories)
+        if risks:
+            heat_map = risk_heatmap_service.generate_heat_map(risks, auto_estimate=True)
+        else:
+            heat_map = HeatMapData(ticker=ticker, points=[], zones={"low": 0, "medium": 0, "high": 0})
         
         return heat_map.model_dump()
         
@@ -0,0 +1,32 @@
+"""
+CLARA — Production server entry point
+
+Runs uvicorn on the uvloop event loop with the httptools parser and without
+per-request access logs outside development.
+
+    python run.py
+
+PORT and HOST come from the environment (Railway sets PORT). The portfolio
+and alert agent live in process memory, so WEB_CONCURRENCY defaults to a
+single worker; raise it only once that state is moved out of process.
+"""
+
+import os
+
+import uvicorn
+
+from config import ACCESS_LOG
+
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        access_log=ACCESS_LOG,
+        log_level="info" if ACCESS_LOG else "warning",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        proxy_headers=True,
+    )
@@ -3,41 +3,116 @@ CLARA — AI Analysis Service
 Structured AI analysis for portfolio and hedge pages with Gemini + deterministic fallback.
 """
 
-import json
+import hashlib
 import logging
-import re
-import urllib.error
-import urllib.parse
-import urllib.request
-from typing import Any, Dict, List
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+import orjson
 
 from config import settings
 
 logger = logging.getLogger("CLARA.ai_analysis")
 
+# Gemini answers keyed by prompt digest; temperature 0.2 makes repeats near-identical
+_RESPONSE_CACHE_SIZE = 1024
+_RESPONSE_CACHE_TTL_SECONDS = 300
+
+_GENERATION_CONFIG = {
+    "temperature": 0.2,
+    "maxOutputTokens": 900,
+    "responseMimeType": "application/json",
+}
+
+# Static prompt heads; the JSON payload is appended per call
+_PORTFOLIO_PROMPT = (
+    "You are a senior portfolio risk analyst. Analyze the portfolio payload and return JSON only. "
+    "Do not include markdown. Keep concise and evidence-based.\n\n"
+    "Return exactly this schema:\n"
+    "{\n"
+    '  "summary": string,\n'
+    '  "confidence": number,\n'
+    '  "key_risks": string[],\n'
+    '  "recommended_actions": string[],\n'
+    '  "assumptions": string[],\n'
+    '  "missing_data": string[],\n'
+    '  "needs_review": boolean\n'
+    "}\n\n"
+    "Rules:\n"
+    "- Mention concentration, beta exposure, and downside risk if relevant.\n"
+    "- Keep confidence conservative if data is incomplete.\n"
+    "- No investment guarantees.\n\n"
+    "Portfolio payload:\n"
+)
+
+_HEDGES_PROMPT = (
+    "You are a derivatives risk analyst. Evaluate hedge proposals and return JSON only. "
+    "Do not include markdown. Keep concise and practical.\n\n"
+    "Return exactly this schema:\n"
+    "{\n"
+    '  "summary": string,\n'
+    '  "confidence": number,\n'
+    '  "key_risks": string[],\n'
+    '  "recommended_actions": string[],\n'
+    '  "assumptions": string[],\n'
+    '  "missing_data": string[],\n'
+    '  "needs_review": boolean\n'
+    "}\n\n"
+    "Rules:\n"
+    "- Highlight cost-efficiency and residual-tail tradeoffs.\n"
+    "- Mention concentration or liquidity concerns.\n"
+    "- Keep confidence conservative if critical data is missing.\n\n"
+    "Hedge proposals:\n"
+)
+
 
 class AIAnalysisService:
     def __init__(self) -> None:
         self.provider = (settings.AI_PROVIDER or "auto").lower()
         self.gemini_model = settings.GEMINI_MODEL or "gemini-2.0-flash"
         self.gemini_api_key = settings.GEMINI_API_KEY
+        self._gemini_url = (
+            f"https://generativelanguage.googleapis.com/v1beta/models/"
+            f"{self.gemini_model}:generateContent?key={self.gemini_api_key}"
+        )
         self.timeout = max(5, settings.AI_TIMEOUT_SECONDS)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._responses: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
 
     @property
     def gemini_enabled(self) -> bool:
         key = (self.gemini_api_key or "").strip()
         return bool(key and key != "your_gemini_key_here")
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled keep-alive client, created on first use and reused for every call."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=2.0),
+                limits=httpx.Limits(max_keepalive_connections=32),
+                headers={"Content-Type": "application/json"},
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def analyze_portfolio(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         if self._use_gemini():
-            ai = self._analyze_portfolio_gemini(payload)
+            ai = await self._analyze_portfolio_gemini(payload)
             if ai:
                 return ai
         return self._portfolio_fallback(payload)
 
     async def analyze_hedges(self, proposals: List[Dict[str, Any]]) -> Dict[str, Any]:
         if self._use_gemini():
-            ai = self._analyze_hedges_gemini(proposals)
+            ai = await self._analyze_hedges_gemini(proposals)
             if ai:
                 return ai
         return self._hedges_fallback(proposals)
@@ -49,38 +124,37 @@ class AIAnalysisService:
             return self.gemini_enabled
         return self.gemini_enabled
 
-    def _gemini_generate_json(self, prompt: str) -> Dict[str, Any] | None:
+    async def _gemini_generate_json(self, prompt: str) -> Dict[str, Any] | None:
         if not self.gemini_enabled:
             return None
 
-        url = (
-            f"https://generativelanguage.googleapis.com/v1beta/models/"
-            f"{self.gemini_model}:generateContent?key={self.gemini_api_key}"
-        )
-
+        key = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+        hit = self._responses.get(key)
+        if hit is not None:
+            if time.monotonic() - hit[0] < _RESPONSE_CACHE_TTL_SECONDS:
+                self._responses.move_to_end(key)
+                return hit[1]
+            del self._responses[key]
+
+        result = await self._gemini_request(prompt)
+        if result is not None:
+            self._responses[key] = (time.monotonic(), result)
+            if len(self._responses) > _RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        return result
+
+    async def _gemini_request(self, prompt: str) -> Dict[str, Any] | None:
         body = {
             "contents": [{"parts": [{"text": prompt}]}],
-            "generationConfig": {
-                "temperature": 0.2,
-                "maxOutputTokens": 900,
-                "responseMimeType": "application/json",
-            },
+            "generationConfig": _GENERATION_CONFIG,
         }
 
-        req = urllib.request.Request(
-            url,
-            data=json.dumps(body).encode("utf-8"),
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                raw = resp.read().decode("utf-8")
-                data = json.loads(raw)
-        except urllib.error.HTTPError as e:
-            msg = e.read().decode("utf-8", errors="ignore") if hasattr(e, "read") else str(e)
-            logger.warning("Gemini HTTP error: %s", msg)
+            resp = await self.client.post(self._gemini_url, content=orjson.dumps(body))
+            resp.raise_for_status()
+            data = orjson.loads(resp.content)
+        except httpx.HTTPStatusError as e:
+            logger.warning("Gemini HTTP error: %s", e.response.text)
             return None
         except Exception as e:
             logger.warning("Gemini call failed: %s", e)
@@ -98,19 +172,15 @@ class AIAnalysisService:
             return None
         text = text.strip()
 
-        try:
-            parsed = json.loads(text)
-            if isinstance(parsed, dict):
-                return parsed
-        except Exception:
-            pass
-
-        json_match = re.search(r"\{[\s\S]*\}", text)
-        if not json_match:
+        # Outermost {...} span (first "{" to last "}"); a bare JSON object
+        # covers the whole text, otherwise this strips fences / prose.
+        start = text.find("{")
+        end   = text.rfind("}")
+        if start < 0 or end < start:
             return None
 
         try:
-            parsed = json.loads(json_match.group(0))
+            parsed = orjson.loads(text[start:end + 1])
             return parsed if isinstance(parsed, dict) else None
         except Exception:
             return None
@@ -142,52 +212,16 @@ class AIAnalysisService:
             "provider": provider,
         }
 
-    def _analyze_portfolio_gemini(self, payload: Dict[str, Any]) -> Dict[str, Any] | None:
-        prompt = (
-            "You are a senior portfolio risk analyst. Analyze the portfolio payload and return JSON only. "
-            "Do not include markdown. Keep concise and evidence-based.\n\n"
-            "Return exactly this schema:\n"
-            "{\n"
-            '  "summary": string,\n'
-            '  "confidence": number,\n'
-            '  "key_risks": string[],\n'
-            '  "recommended_actions": string[],\n'
-            '  "assumptions": string[],\n'
-            '  "missing_data": string[],\n'
-            '  "needs_review": boolean\n'
-            "}\n\n"
-            "Rules:\n"
-            "- Mention concentration, beta exposure, and downside risk if relevant.\n"
-            "- Keep confidence conservative if data is incomplete.\n"
-            "- No investment guarantees.\n\n"
-            f"Portfolio payload:\n{json.dumps(payload, ensure_ascii=False)}"
-        )
-        raw = self._gemini_generate_json(prompt)
+    async def _analyze_portfolio_gemini(self, payload: Dict[str, Any]) -> Dict[str, Any] | None:
+        prompt = _PORTFOLIO_PROMPT + orjson.dumps(payload).decode()
+        raw = await self._gemini_generate_json(prompt)
         if not raw:
             return None
         return self._normalize_result(raw, provider="gemini")
 
-    def _analyze_hedges_gemini(self, proposals: List[Dict[str, Any]]) -> Dict[str, Any] | None:
-        prompt = (
-            "You are a derivatives risk analyst. Evaluate hedge proposals and return JSON only. "
-            "Do not include markdown. Keep concise and practical.\n\n"
-            "Return exactly this schema:\n"
-            "{\n"
-            '  "summary": string,\n'
-            '  "confidence": number,\n'
-            '  "key_risks": string[],\n'
-            '  "recommended_actions": string[],\n'
-            '  "assumptions": string[],\n'
-            '  "missing_data": string[],\n'
-            '  "needs_review": boolean\n'
-            "}\n\n"
-            "Rules:\n"
-            "- Highlight cost-efficiency and residual-tail tradeoffs.\n"
-            "- Mention concentration or liquidity concerns.\n"
-            "- Keep confidence conservative if critical data is missing.\n\n"
-            f"Hedge proposals:\n{json.dumps(proposals, ensure_ascii=False)}"
-        )
-        raw = self._gemini_generate_json(prompt)
+    async def _analyze_hedges_gemini(self, proposals: List[Dict[str, Any]]) -> Dict[str, Any] | None:
+        prompt = _HEDGES_PROMPT + orjson.dumps(proposals).decode()
+        raw = await self._gemini_generate_json(prompt)
         if not raw:
             return None
         return self._normalize_result(raw, provider="gemini")
@@ -267,12 +301,15 @@ class AIAnalysisService:
                 "provider": "fallback",
             }
 
-        sorted_by_eff = sorted(proposals, key=lambda p: float(p.get("effectiveness_pct", 0)), reverse=True)
-        sorted_by_cost = sorted(proposals, key=lambda p: float(p.get("cost_pct", 0)))
-        avg_residual = sum(float(p.get("residual_tail", 0)) for p in proposals) / len(proposals)
+        n = len(proposals)
+        eff = np.fromiter((float(p.get("effectiveness_pct", 0)) for p in proposals), dtype=np.float64, count=n)
+        cost = np.fromiter((float(p.get("cost_pct", 0)) for p in proposals), dtype=np.float64, count=n)
+        residual = np.fromiter((float(p.get("residual_tail", 0)) for p in proposals), dtype=np.float64, count=n)
+        avg_residual = float(residual.mean())
 
-        best_eff = sorted_by_eff[0]
-        best_cost = sorted_by_cost[0]
+        # argmax/argmin return the first extreme, matching the old stable-sort picks
+        best_eff = proposals[int(eff.argmax())]
+        best_cost = proposals[int(cost.argmin())]
 
         key_risks = []
         actions = []
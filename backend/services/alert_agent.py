@@ -12,40 +12,82 @@ Features:
 """
 
 import asyncio
+import heapq
 import logging
+import sys
 import time
 import uuid
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
-from config import settings
+import numpy as np
+
+from config import ALERT_CHECK_INTERVAL_SECONDS, ALERT_COOLDOWN_HOURS
 from models.schemas import AlertConfig, AlertLogEntry, AlertType, InAppAlert, AlertSeverity
-from services.email_service import send_alert_email
+from services.email_service import email_batcher, send_alert_email
 from services.stock_data import get_quotes_batch
 
 logger = logging.getLogger("CLARA.alert_agent")
 
+_COOLDOWN_SECONDS = ALERT_COOLDOWN_HOURS * 3600.0
+_COOLDOWN_MAX     = 10_000   # live cooldown entries before the earliest are force-expired
+
+MAX_IN_APP_ALERTS = 200
+MAX_EMAIL_LOGS    = 500
+
+# Polling cadence: never faster than the floor; after _BACKOFF_AFTER_TICKS
+# sweeps with identical prices the interval doubles up to the cap, and the
+# US cash session being closed stretches it further.
+_MIN_POLL_INTERVAL    = 5.0
+_MAX_POLL_INTERVAL    = 60.0
+_CLOSED_POLL_INTERVAL = _MAX_POLL_INTERVAL * 10
+_BACKOFF_AFTER_TICKS  = 3
+# Weekday UTC window covering 09:30–16:00 New York in both EST and EDT
+_MARKET_OPEN_UTC  = 13 * 60 + 30
+_MARKET_CLOSE_UTC = 21 * 60
+
+# Price-target rules, checked in this order per holding:
+# (alert type, AlertConfig toggle, holding key, default when missing, trigger test)
+_THRESHOLD_RULES = (
+    (AlertType.SELL_TARGET_HIT,   "alert_on_sell_target",   "sell_target",   float("inf"), np.greater_equal),
+    (AlertType.STOP_LOSS_HIT,     "alert_on_stop_loss",     "stop_loss",     0.0,          np.less_equal),
+    (AlertType.TRAILING_STOP_HIT, "alert_on_trailing_stop", "trailing_stop", 0.0,          np.less_equal),
+    (AlertType.BULL_TARGET_HIT,   "alert_on_bull_target",   "bull_target",   float("inf"), np.greater_equal),
+)
+
+
+def _market_open(now: datetime) -> bool:
+    minute = now.hour * 60 + now.minute
+    return now.weekday() < 5 and _MARKET_OPEN_UTC <= minute < _MARKET_CLOSE_UTC
+
+
+_SEVERITY_MAP = {
+    AlertType.STOP_LOSS_HIT:     AlertSeverity.CRITICAL,
+    AlertType.TRAILING_STOP_HIT: AlertSeverity.WARNING,
+    AlertType.SELL_TARGET_HIT:   AlertSeverity.SUCCESS,
+    AlertType.BULL_TARGET_HIT:   AlertSeverity.SUCCESS,
+    AlertType.DAILY_SUMMARY:     AlertSeverity.INFO,
+}
+
+_MESSAGE_TEMPLATES = {
+    AlertType.SELL_TARGET_HIT:   "{symbol} reached its sell target at ${price:.2f}. Consider taking profits.",
+    AlertType.STOP_LOSS_HIT:     "{symbol} breached stop loss at ${price:.2f}. Review immediately.",
+    AlertType.TRAILING_STOP_HIT: "{symbol} hit trailing stop at ${price:.2f}. Consider reducing exposure.",
+    AlertType.BULL_TARGET_HIT:   "{symbol} reached bull case target at ${price:.2f}. Excellent — take profits?",
+    AlertType.DAILY_SUMMARY:     "Daily portfolio summary generated.",
+}
+
 
 def _severity(alert_type: AlertType) -> AlertSeverity:
-    return {
-        AlertType.STOP_LOSS_HIT:     AlertSeverity.CRITICAL,
-        AlertType.TRAILING_STOP_HIT: AlertSeverity.WARNING,
-        AlertType.SELL_TARGET_HIT:   AlertSeverity.SUCCESS,
-        AlertType.BULL_TARGET_HIT:   AlertSeverity.SUCCESS,
-        AlertType.DAILY_SUMMARY:     AlertSeverity.INFO,
-    }.get(alert_type, AlertSeverity.INFO)
+    return _SEVERITY_MAP.get(alert_type, AlertSeverity.INFO)
 
 
 def _message(alert_type: AlertType, symbol: str, price: float) -> str:
-    p = f"${price:.2f}"
-    return {
-        AlertType.SELL_TARGET_HIT:   f"{symbol} reached its sell target at {p}. Consider taking profits.",
-        AlertType.STOP_LOSS_HIT:     f"{symbol} breached stop loss at {p}. Review immediately.",
-        AlertType.TRAILING_STOP_HIT: f"{symbol} hit trailing stop at {p}. Consider reducing exposure.",
-        AlertType.BULL_TARGET_HIT:   f"{symbol} reached bull case target at {p}. Excellent — take profits?",
-        AlertType.DAILY_SUMMARY:     "Daily portfolio summary generated.",
-    }.get(alert_type, f"{symbol} price alert at {p}")
+    tmpl = _MESSAGE_TEMPLATES.get(alert_type)
+    if tmpl is None:
+        return f"{symbol} price alert at ${price:.2f}"
+    return tmpl.format(symbol=symbol, price=price)
 
 
 class AlertAgent:
@@ -60,18 +102,40 @@ class AlertAgent:
 
     def __init__(self) -> None:
         self.config: AlertConfig        = AlertConfig()
+        self.config_version: int        = 0   # bumped on every config update (ETag)
         self.holdings: List[Dict[str, Any]] = []
-        self.in_app_alerts: List[InAppAlert] = []
-        self.email_logs: List[AlertLogEntry]  = []
-
-        # Cooldown registry: (symbol, alert_type) → datetime of last send
-        self._cooldowns: Dict[tuple, datetime] = {}
+        # Newest first; the oldest entry falls off the right end once full
+        self.in_app_alerts: Deque[InAppAlert] = deque(maxlen=MAX_IN_APP_ALERTS)
+        self.email_logs: Deque[AlertLogEntry] = deque(maxlen=MAX_EMAIL_LOGS)
+        self._alerts_by_id: Dict[str, InAppAlert] = {}
+
+        # Cooldown registry: (symbol, alert_type) → monotonic expiry time,
+        # with a min-heap of (expiry, key) so expired entries can be pruned
+        self._cooldowns: Dict[Tuple[str, AlertType], float] = {}
+        self._cooldown_heap: List[Tuple[float, Tuple[str, AlertType]]] = []
+
+        # Derived views, maintained on mutation so status polls are O(1)
+        self._symbols_cache: List[str] = []
+        # Per-holding threshold columns (holding key → array in holdings order)
+        self._thresholds: Dict[str, np.ndarray] = {}
+        # Threshold keys that at least one holding actually sets
+        self._active_keys: frozenset = frozenset()
+        self._total_value: float = 0.0
+        # Unacknowledged alerts by id, newest first (same order as in_app_alerts)
+        self._unacked: "OrderedDict[str, InAppAlert]" = OrderedDict()
+
+        # Poll backoff: price fingerprint of the last sweep and how many
+        # consecutive sweeps saw no change
+        self._last_prices: bytes = b""
+        self._idle_ticks: int    = 0
 
         # Stats
         self._start_time: float = time.monotonic()
         self.alerts_today: int  = 0
         self._running: bool     = False
+        self._loop_task: Optional[asyncio.Task] = None
         self.status: str        = "idle"
+        self._apply_batching()
 
     # ── Properties ───────────────────────────────────────────────────────────
 
@@ -79,32 +143,82 @@ class AlertAgent:
     def uptime_seconds(self) -> float:
         return round(time.monotonic() - self._start_time, 1)
 
+    @property
+    def monitored_symbols(self) -> List[str]:
+        return self._symbols_cache
+
+    @property
+    def unacknowledged_count(self) -> int:
+        return len(self._unacked)
+
+    @property
+    def unacknowledged_alerts(self) -> List[InAppAlert]:
+        return list(self._unacked.values())
+
     # ── Configuration ─────────────────────────────────────────────────────────
 
     def update_config(self, updates: Dict[str, Any]) -> AlertConfig:
         for key, val in updates.items():
             if hasattr(self.config, key) and val is not None:
                 setattr(self.config, key, val)
+        self._apply_batching()
+        self.config_version += 1
         logger.info("Alert config updated: %s", updates)
         return self.config
 
+    def _apply_batching(self) -> None:
+        email_batcher.max_batch = max(1, self.config.email_batch_max)
+        email_batcher.max_wait  = max(0.0, self.config.email_batch_wait_seconds)
+
     def register_holdings(self, holdings: List[Dict[str, Any]]) -> None:
         """Register the current portfolio positions for monitoring."""
+        n = len(holdings)
+        self._thresholds = {
+            key: np.fromiter((h.get(key, default) for h in holdings), dtype=np.float64, count=n)
+            for _, _, key, default, _ in _THRESHOLD_RULES
+        }
+        # A column left entirely at its default can never fire
+        self._active_keys = frozenset(
+            key for _, _, key, default, _ in _THRESHOLD_RULES
+            if (self._thresholds[key] != default).any()
+        )
+        self._total_value = float(sum(h.get("market_value", 0) for h in holdings))
+        # Interned so cooldown-key lookups compare symbols by identity
+        for h in holdings:
+            h["symbol"] = sys.intern(h["symbol"])
+        self._symbols_cache = [h["symbol"] for h in holdings]
         self.holdings = holdings
         logger.debug("Alert agent registered %d positions", len(holdings))
 
     # ── Cooldown ──────────────────────────────────────────────────────────────
 
     def _can_send(self, symbol: str, alert_type: AlertType) -> bool:
-        key      = (symbol, alert_type)
-        last_sent = self._cooldowns.get(key)
-        if last_sent is None:
-            return True
-        cooldown_hours = settings.ALERT_COOLDOWN_HOURS
-        return datetime.utcnow() - last_sent > timedelta(hours=cooldown_hours)
+        expires_at = self._cooldowns.get((symbol, alert_type))
+        return expires_at is None or time.monotonic() > expires_at
 
     def _mark_sent(self, symbol: str, alert_type: AlertType) -> None:
-        self._cooldowns[(symbol, alert_type)] = datetime.utcnow()
+        now        = time.monotonic()
+        key        = (symbol, alert_type)
+        expires_at = now + _COOLDOWN_SECONDS
+        self._cooldowns[key] = expires_at
+        heap = self._cooldown_heap
+        heapq.heappush(heap, (expires_at, key))
+
+        # Prune expired entries; over the cap, also drop the earliest 10%
+        forced = len(self._cooldowns) // 10 if len(self._cooldowns) > _COOLDOWN_MAX else 0
+        while heap and (heap[0][0] < now or forced > 0):
+            expiry, old_key = heapq.heappop(heap)
+            # Skip heap entries superseded by a later send or a reset
+            if self._cooldowns.get(old_key) == expiry:
+                del self._cooldowns[old_key]
+                forced -= 1
+
+    def _claim(self, symbol: str, alert_type: AlertType) -> bool:
+        """Start the cooldown and return True if this alert may fire now."""
+        if not self._can_send(symbol, alert_type):
+            return False
+        self._mark_sent(symbol, alert_type)
+        return True
 
     def reset_cooldown(self, symbol: str, alert_type: AlertType) -> None:
         self._cooldowns.pop((symbol, alert_type), None)
@@ -119,13 +233,12 @@ class AlertAgent:
         trigger_price: float,
         total_portfolio_value: float,
     ) -> None:
+        """Record and deliver an alert. Callers claim the cooldown first (see _claim)."""
         symbol  = holding["symbol"]
         company = holding.get("company", symbol)
         price   = holding.get("current_price", trigger_price)
 
-        if not self._can_send(symbol, alert_type):
-            return
-        self._mark_sent(symbol, alert_type)
+        message = _message(alert_type, symbol, trigger_price)
 
         # In-app notification
         alert = InAppAlert(
@@ -134,15 +247,21 @@ class AlertAgent:
             alert_type=alert_type,
             symbol=symbol,
             company=company,
-            message=_message(alert_type, symbol, trigger_price),
+            message=message,
             trigger_price=trigger_price,
             current_price=price,
             severity=_severity(alert_type),
             acknowledged=False,
             email_sent=False,
         )
-        self.in_app_alerts.insert(0, alert)
-        self.in_app_alerts = self.in_app_alerts[:200]  # cap at 200
+        if len(self.in_app_alerts) == MAX_IN_APP_ALERTS:
+            evicted = self.in_app_alerts.pop()
+            self._alerts_by_id.pop(evicted.id, None)
+            self._unacked.pop(evicted.id, None)
+        self.in_app_alerts.appendleft(alert)
+        self._alerts_by_id[alert.id] = alert
+        self._unacked[alert.id] = alert
+        self._unacked.move_to_end(alert.id, last=False)
         self.alerts_today += 1
         logger.info("Alert fired: %s %s @ $%.2f", symbol, alert_type, trigger_price)
 
@@ -160,16 +279,12 @@ class AlertAgent:
                 gain_loss=holding.get("gain_loss", 0),
                 gain_loss_pct=holding.get("gain_loss_pct", 0),
                 portfolio_value=total_portfolio_value,
-                action_message=_message(alert_type, symbol, trigger_price),
+                action_message=message,
             )
-            self.email_logs.insert(0, log)
-            self.email_logs = self.email_logs[:500]
+            self.email_logs.appendleft(log)
 
             # Update in-app alert with email status
-            for a in self.in_app_alerts:
-                if a.id == alert.id:
-                    a.email_sent = log.sent
-                    break
+            alert.email_sent = log.sent
 
     # ── Check Loop ────────────────────────────────────────────────────────────
 
@@ -178,56 +293,103 @@ class AlertAgent:
         if not self.holdings:
             return
 
-        symbols = [h["symbol"] for h in self.holdings]
+        # Bind the current registration; register_holdings may swap it mid-await
+        holdings    = self.holdings
+        symbols     = self._symbols_cache
+        thresholds  = self._thresholds
+        active      = self._active_keys
+        total_value = self._total_value
         try:
             quotes = await get_quotes_batch(symbols)
         except Exception as exc:
             logger.error("Alert agent price fetch failed: %s", exc)
+            self._idle_ticks += 1
             return
 
-        total_value = sum(h.get("market_value", 0) for h in self.holdings)
+        prices = np.fromiter(
+            (quotes.get(sym, {}).get("price", h.get("current_price", 0)) for sym, h in zip(symbols, holdings)),
+            dtype=np.float64, count=len(holdings),
+        )
 
-        for holding in self.holdings:
-            sym   = holding["symbol"]
-            quote = quotes.get(sym, {})
-            price = quote.get("price", holding.get("current_price", 0))
+        fingerprint = prices.tobytes()
+        if fingerprint == self._last_prices:
+            self._idle_ticks += 1
+        else:
+            self._idle_ticks  = 0
+            self._last_prices = fingerprint
 
-            # Update holding with fresh price
+        # Update holdings with fresh prices
+        for holding, price in zip(holdings, prices.tolist()):
             holding["current_price"] = price
 
-            # Check thresholds
-            cfg = self.config
-            if cfg.alert_on_sell_target and price >= holding.get("sell_target", float("inf")):
-                await self._fire_alert(AlertType.SELL_TARGET_HIT, holding, holding["sell_target"], total_value)
-
-            if cfg.alert_on_stop_loss and price <= holding.get("stop_loss", 0):
-                await self._fire_alert(AlertType.STOP_LOSS_HIT, holding, holding["stop_loss"], total_value)
+        # Check thresholds: one vector comparison per enabled rule that some
+        # holding actually sets
+        cfg    = self.config
+        checks = [
+            (alert_type, key, test(prices, thresholds[key]))
+            for alert_type, flag, key, _, test in _THRESHOLD_RULES
+            if key in active and getattr(cfg, flag)
+        ]
+        if not checks:
+            return
 
-            if cfg.alert_on_trailing_stop and price <= holding.get("trailing_stop", 0):
-                await self._fire_alert(AlertType.TRAILING_STOP_HIT, holding, holding["trailing_stop"], total_value)
+        # Cooldowns are claimed synchronously, so each (symbol, alert_type)
+        # is queued at most once; the email sends then run concurrently.
+        hit   = np.logical_or.reduce([mask for _, _, mask in checks])
+        fires = []
+        for i in np.flatnonzero(hit).tolist():
+            holding = holdings[i]
+            for alert_type, key, mask in checks:
+                if mask[i] and self._claim(holding["symbol"], alert_type):
+                    fires.append(self._fire_alert(alert_type, holding, holding[key], total_value))
+        if not fires:
+            return
 
-            if cfg.alert_on_bull_target and price >= holding.get("bull_target", float("inf")):
-                await self._fire_alert(AlertType.BULL_TARGET_HIT, holding, holding["bull_target"], total_value)
+        for result in await asyncio.gather(*fires, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error("Alert delivery failed: %s", result)
 
     # ── Background Loop ───────────────────────────────────────────────────────
 
     async def run_monitoring_loop(self) -> None:
-        """Infinite polling loop — run as asyncio background task."""
-        self._running = True
-        self.status   = "running"
-        logger.info("Alert agent started. Interval: %ds", settings.ALERT_CHECK_INTERVAL_SECONDS)
-
-        while self._running:
-            if self.config.enabled and self.holdings:
-                self.status = "running"
-                try:
-                    await self._check_once()
-                except Exception as exc:
-                    logger.error("Alert check failed: %s", exc)
-            else:
-                self.status = "paused"
-
-            await asyncio.sleep(self.config.check_interval_seconds or settings.ALERT_CHECK_INTERVAL_SECONDS)
+        """Infinite polling loop — run as asyncio background task (one per process)."""
+        current = asyncio.current_task()
+        if self._loop_task is not None and not self._loop_task.done():
+            logger.warning("Alert agent loop already running; not starting another")
+            return
+        self._loop_task = current
+        self._running   = True
+        self.status     = "running"
+        logger.info("Alert agent started. Interval: %ds", ALERT_CHECK_INTERVAL_SECONDS)
+
+        try:
+            while self._running and self._loop_task is current:
+                if self.config.enabled and self.holdings:
+                    self.status = "running"
+                    try:
+                        await self._check_once()
+                    except Exception as exc:
+                        logger.error("Alert check failed: %s", exc)
+                else:
+                    self.status = "paused"
+
+                await asyncio.sleep(self._poll_interval())
+        finally:
+            if self._loop_task is current:
+                self._loop_task = None
+                self._running   = False
+                self.status     = "stopped"
+
+    def _poll_interval(self) -> float:
+        """Seconds to sleep before the next sweep."""
+        interval = max(_MIN_POLL_INTERVAL, self.config.check_interval_seconds or ALERT_CHECK_INTERVAL_SECONDS)
+        if not _market_open(datetime.utcnow()):
+            # Never poll more often after hours than the user configured
+            return max(interval, _CLOSED_POLL_INTERVAL)
+        backoff  = self._idle_ticks - _BACKOFF_AFTER_TICKS + 1
+        if backoff > 0 and interval < _MAX_POLL_INTERVAL:
+            interval = min(_MAX_POLL_INTERVAL, interval * 2 ** min(backoff, 16))
+        return interval
 
     def stop(self) -> None:
         self._running = False
@@ -236,23 +398,26 @@ class AlertAgent:
     # ── Alert Management ──────────────────────────────────────────────────────
 
     def acknowledge_alert(self, alert_id: str) -> bool:
-        for a in self.in_app_alerts:
-            if a.id == alert_id:
-                a.acknowledged = True
-                return True
-        return False
+        alert = self._unacked.pop(alert_id, None)
+        if alert is not None:
+            alert.acknowledged = True
+            return True
+        # Already acknowledged — still report success if the alert exists
+        return alert_id in self._alerts_by_id
 
     def clear_all_alerts(self) -> None:
         self.in_app_alerts.clear()
+        self._alerts_by_id.clear()
+        self._unacked.clear()
 
     async def send_test_alert(self, symbol: str, alert_type: AlertType) -> Optional[InAppAlert]:
         """Manually trigger a test alert for a given symbol."""
         holding = next((h for h in self.holdings if h["symbol"] == symbol), None)
         if not holding:
             return None
-        total_value = sum(h.get("market_value", 0) for h in self.holdings)
         self.reset_cooldown(symbol, alert_type)
-        await self._fire_alert(alert_type, holding, holding.get("sell_target", 100.0), total_value)
+        self._mark_sent(symbol, alert_type)
+        await self._fire_alert(alert_type, holding, holding.get("sell_target", 100.0), self._total_value)
         return self.in_app_alerts[0] if self.in_app_alerts else None
 
 
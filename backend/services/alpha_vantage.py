@@ -15,17 +15,31 @@ Endpoints covered:
 
 import asyncio
 import logging
-from datetime import date, datetime
+import time
 from typing import Optional, Dict, List, Any
 
 import httpx
+import numpy as np
+import orjson
 
 from config import settings
+from services.av_cache import ScanResistantCache
 
 logger = logging.getLogger("CLARA.alpha_vantage")
 
 BASE_URL = settings.ALPHA_VANTAGE_BASE_URL
-_rate_counter: Dict[str, int] = {}   # date_str → request count
+_client: Optional[httpx.AsyncClient] = None
+
+# Payloads that change at most a few times a day: function → TTL (seconds)
+_CACHE_TTL: Dict[str, float] = {
+    "OVERVIEW": 24 * 3600,
+    "RSI":          3600,
+    "MACD":         3600,
+}
+# Daily bars are cached as parsed columns rather than raw payloads: a full
+# 20-year series is a few MB as nested JSON dicts but ~200KB as arrays.
+_DAILY_COLUMNS_TTL = 6 * 3600
+_response_cache = ScanResistantCache()
 
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
@@ -35,57 +49,125 @@ def _is_configured() -> bool:
     return bool(key) and key != "your_alpha_vantage_key_here"
 
 
-def _get_rate_count() -> int:
-    today = str(date.today())
-    return _rate_counter.get(today, 0)
+class _TokenBucket:
+    """`rate` tokens per `period` seconds, refilled continuously, bursting to `rate`."""
+
+    def __init__(self, rate: int, period: float) -> None:
+        self.capacity = float(rate)
+        self._per_sec = rate / period
+        self._tokens  = float(rate)
+        self._stamp   = time.monotonic()
+
+    @property
+    def level(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self._per_sec)
+        self._stamp  = now
+        return self._tokens
+
+    def wait_time(self) -> float:
+        """Seconds until a token is free for the next caller."""
+        level = self.level
+        return 0.0 if level >= 1.0 else (1.0 - level) / self._per_sec
 
+    def take(self) -> None:
+        # May go negative: later callers then queue behind this reservation
+        self._tokens -= 1.0
 
-def _increment_rate() -> None:
-    today = str(date.today())
-    _rate_counter[today] = _rate_counter.get(today, 0) + 1
+
+_daily_bucket  = _TokenBucket(settings.ALPHA_VANTAGE_DAILY_LIMIT, 86400.0)
+_minute_bucket = _TokenBucket(settings.ALPHA_VANTAGE_MINUTE_LIMIT, 60.0)
+_MAX_RATE_WAIT = 15.0   # longer than this, fall through to the next data source
+
+
+async def _acquire_slot() -> bool:
+    """
+    Reserve one request against both buckets, sleeping until the per-minute
+    pacing allows it. Returns False (reserving nothing) if the wait would
+    exceed _MAX_RATE_WAIT or the daily budget is spent.
+    """
+    if _daily_bucket.wait_time() > 0.0:
+        return False
+    wait = _minute_bucket.wait_time()
+    if wait > _MAX_RATE_WAIT:
+        return False
+    _daily_bucket.take()
+    _minute_bucket.take()
+    if wait > 0.0:
+        await asyncio.sleep(wait)
+    return True
 
 
-def _within_limit() -> bool:
-    return _get_rate_count() < settings.ALPHA_VANTAGE_DAILY_LIMIT
+def is_available() -> bool:
+    """Configured and with daily budget left — the cheap check for the fallback cascade."""
+    return _is_configured() and _daily_bucket.level >= 1.0
 
 
 def get_rate_status() -> Dict[str, Any]:
-    count = _get_rate_count()
+    level = _daily_bucket.level
     return {
-        "requests_today": count,
+        "requests_today": round(_daily_bucket.capacity - level),
         "daily_limit": settings.ALPHA_VANTAGE_DAILY_LIMIT,
-        "within_limit": count < settings.ALPHA_VANTAGE_DAILY_LIMIT,
+        "within_limit": level >= 1.0,
         "configured": _is_configured(),
-        "reset_at": "midnight UTC",
+        "reset_at": "rolling 24h",
     }
 
 
+def _http() -> httpx.AsyncClient:
+    """Pooled keep-alive client, created on first use and reused for every call."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(12.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0),
+        )
+    return _client
+
+
+async def aclose() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
 async def _get(params: Dict[str, str], timeout: float = 12.0) -> Optional[Dict[str, Any]]:
     """Execute a GET request to Alpha Vantage."""
+    ttl = _CACHE_TTL.get(params["function"])
+    if ttl is not None:
+        cache_key = tuple(sorted(params.items()))
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     if not _is_configured():
         logger.debug("Alpha Vantage not configured — skipping request")
         return None
-    if not _within_limit():
-        logger.warning("Alpha Vantage daily limit reached (%d/%d)", _get_rate_count(), settings.ALPHA_VANTAGE_DAILY_LIMIT)
+    if not await _acquire_slot():
+        logger.warning(
+            "Alpha Vantage rate limit reached (%d/day, %d/min)",
+            settings.ALPHA_VANTAGE_DAILY_LIMIT, settings.ALPHA_VANTAGE_MINUTE_LIMIT,
+        )
         return None
 
     params["apikey"] = settings.ALPHA_VANTAGE_API_KEY
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.get(BASE_URL, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-            _increment_rate()
-
-            if "Note" in data:
-                logger.warning("Alpha Vantage rate limit note: %s", data["Note"])
-                return None
-            if "Information" in data:
-                logger.warning("Alpha Vantage info: %s", data["Information"])
-                return None
-
-            return data
+        resp = await _http().get(BASE_URL, params=params, timeout=timeout)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+
+        if "Note" in data:
+            logger.warning("Alpha Vantage rate limit note: %s", data["Note"])
+            return None
+        if "Information" in data:
+            logger.warning("Alpha Vantage info: %s", data["Information"])
+            return None
+
+        if ttl is not None:
+            _response_cache.put(cache_key, data, ttl)
+        return data
     except httpx.TimeoutException:
         logger.error("Alpha Vantage request timed out (params=%s)", params)
         return None
@@ -94,6 +176,55 @@ async def _get(params: Dict[str, str], timeout: float = 12.0) -> Optional[Dict[s
         return None
 
 
+# ── OHLCV bars ────────────────────────────────────────────────────────────────
+
+_BAR_FIELDS = ("date", "open", "high", "low", "close", "volume")
+
+
+def _bar_columns(series: Dict[str, Dict[str, str]]) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Parse an Alpha Vantage time series into columns sorted oldest → newest.
+    Bars that fail to parse are skipped. Returns None for an empty series.
+    """
+    n = len(series)
+    if not n:
+        return None
+    dates  = np.empty(n, dtype=object)
+    prices = np.empty((4, n), dtype=np.float64)
+    volume = np.empty(n, dtype=np.int64)
+
+    valid = 0
+    for dt_str, bar in series.items():
+        try:
+            prices[:, valid] = (bar["1. open"], bar["2. high"], bar["3. low"], bar["4. close"])
+            volume[valid]    = int(bar["5. volume"])
+        except (KeyError, ValueError):
+            continue
+        dates[valid] = dt_str
+        valid += 1
+    if not valid:
+        return None
+
+    # ISO date strings sort chronologically
+    order = np.argsort(dates[:valid].astype(str), kind="stable")
+    return {
+        "date":   dates[order],
+        "open":   prices[0, order],
+        "high":   prices[1, order],
+        "low":    prices[2, order],
+        "close":  prices[3, order],
+        "volume": volume[order],
+    }
+
+
+def _bar_rows(columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Columns → row dicts for JSON responses."""
+    return [
+        dict(zip(_BAR_FIELDS, row))
+        for row in zip(*(columns[field].tolist() for field in _BAR_FIELDS))
+    ]
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # GLOBAL QUOTE
 # ══════════════════════════════════════════════════════════════════════════════
@@ -136,62 +267,68 @@ async def fetch_quote(symbol: str) -> Optional[Dict[str, Any]]:
 
 
 async def fetch_quotes_batch(
-    symbols: List[str], delay_seconds: float = 0.3
+    symbols: List[str], concurrency: int = 5
 ) -> Dict[str, Dict[str, Any]]:
     """
-    Fetch quotes for multiple symbols sequentially (rate-limit safe).
-    Returns dict of symbol → quote.
+    Fetch quotes for multiple symbols concurrently, at most `concurrency` in flight.
+    Returns dict of symbol → quote (failed symbols are omitted).
     """
-    results: Dict[str, Dict[str, Any]] = {}
-    for sym in symbols:
-        q = await fetch_quote(sym)
-        if q:
-            results[sym] = q
-        if delay_seconds > 0:
-            await asyncio.sleep(delay_seconds)
-    return results
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(sym: str) -> Optional[Dict[str, Any]]:
+        async with sem:
+            return await fetch_quote(sym)
+
+    quotes = await asyncio.gather(*(_one(sym) for sym in symbols), return_exceptions=True)
+    return {
+        sym: q for sym, q in zip(symbols, quotes)
+        if q and not isinstance(q, BaseException)
+    }
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 # TIME SERIES — DAILY
 # ══════════════════════════════════════════════════════════════════════════════
 
-async def fetch_daily_series(
+async def fetch_daily_columns(
     symbol: str, outputsize: str = "compact"
-) -> List[Dict[str, Any]]:
+) -> Optional[Dict[str, np.ndarray]]:
     """
-    Fetch daily OHLCV bars.
+    Fetch daily OHLCV bars as columns, oldest → newest.
     outputsize: 'compact' = last 100 bars | 'full' = up to 20 years
+    The returned arrays are shared with the cache and read-only.
     """
+    cache_key = ("TIME_SERIES_DAILY", symbol, outputsize)
+    columns = _response_cache.get(cache_key)
+    if columns is not None:
+        return columns
+
     data = await _get({
         "function":   "TIME_SERIES_DAILY",
         "symbol":     symbol,
         "outputsize": outputsize,
     }, timeout=20.0)
     if not data:
-        return []
+        return None
+    columns = _bar_columns(data.get("Time Series (Daily)", {}))
+    del data   # drop the JSON tree before anything else is awaited
+    if columns is None:
+        return None
 
-    series = data.get("Time Series (Daily)", {})
-    if not series:
-        return []
+    for col in columns.values():
+        col.flags.writeable = False
+    _response_cache.put(cache_key, columns, _DAILY_COLUMNS_TTL)
+    return columns
 
-    bars = []
-    for dt_str, bar in series.items():
-        try:
-            bars.append({
-                "date":   dt_str,
-                "open":   float(bar["1. open"]),
-                "high":   float(bar["2. high"]),
-                "low":    float(bar["3. low"]),
-                "close":  float(bar["4. close"]),
-                "volume": int(bar["5. volume"]),
-            })
-        except (KeyError, ValueError):
-            continue
 
-    # Sort oldest → newest, return last 90 bars
-    bars.sort(key=lambda x: x["date"])
-    return bars[-90:]
+async def fetch_daily_series(
+    symbol: str, outputsize: str = "compact"
+) -> List[Dict[str, Any]]:
+    """Fetch daily OHLCV bars; returns the last 90 as row dicts."""
+    columns = await fetch_daily_columns(symbol, outputsize)
+    if columns is None:
+        return []
+    return _bar_rows({field: col[-90:] for field, col in columns.items()})
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -213,27 +350,8 @@ async def fetch_intraday(
     if not data:
         return []
 
-    key = f"Time Series ({interval})"
-    series = data.get(key, {})
-    if not series:
-        return []
-
-    bars = []
-    for dt_str, bar in series.items():
-        try:
-            bars.append({
-                "date":   dt_str,
-                "open":   float(bar["1. open"]),
-                "high":   float(bar["2. high"]),
-                "low":    float(bar["3. low"]),
-                "close":  float(bar["4. close"]),
-                "volume": int(bar["5. volume"]),
-            })
-        except (KeyError, ValueError):
-            continue
-
-    bars.sort(key=lambda x: x["date"])
-    return bars
+    columns = _bar_columns(data.get(f"Time Series ({interval})", {}))
+    return _bar_rows(columns) if columns is not None else []
 
 
 # ══════════════════════════════════════════════════════════════════════════════
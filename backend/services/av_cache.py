@@ -0,0 +1,92 @@
+"""
+CLARA — Alpha Vantage Response Cache
+Scan-resistant, TTL-bounded cache for Alpha Vantage payloads that change at
+most a few times a day (fundamentals, daily bars, indicators).
+
+Layout (relaxed LRU with a cooling FIFO):
+  - New entries land in the cooling FIFO (probation).
+  - A hit on a cooling entry promotes it to the hot set.
+  - When the hot set is full, a random hot entry is demoted back to the
+    cooling FIFO rather than tracking exact recency.
+  - The cooling FIFO evicts its oldest entry when full.
+
+A portfolio refresh that walks many symbols once therefore only churns the
+cooling FIFO and cannot flush the symbols that are read repeatedly.
+"""
+
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+_Entry = Tuple[float, Any]   # (monotonic expiry, value)
+
+
+class ScanResistantCache:
+    def __init__(self, hot_size: int = 256, cooling_size: int = 128) -> None:
+        self.hot_size     = hot_size
+        self.cooling_size = cooling_size
+        # Hot set: key → (slot in _hot_keys, expiry, value); the key list
+        # gives O(1) random victim selection with swap-remove.
+        self._hot: Dict[Hashable, List[Any]] = {}
+        self._hot_keys: List[Hashable] = []
+        self._cooling: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self.hits   = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._hot) + len(self._cooling)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        slot = self._hot.get(key)
+        if slot is not None:
+            if slot[1] > now:
+                self.hits += 1
+                return slot[2]
+            self._remove_hot(key)
+        else:
+            entry = self._cooling.pop(key, None)
+            if entry is not None and entry[0] > now:
+                self._promote(key, entry)
+                self.hits += 1
+                return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, value: Any, ttl: float) -> None:
+        entry = (time.monotonic() + ttl, value)
+        slot = self._hot.get(key)
+        if slot is not None:
+            slot[1], slot[2] = entry
+            return
+        self._cooling.pop(key, None)
+        self._cool(key, entry)
+
+    def clear(self) -> None:
+        self._hot.clear()
+        self._hot_keys.clear()
+        self._cooling.clear()
+
+    # ── Internals ────────────────────────────────────────────────────────────
+
+    def _promote(self, key: Hashable, entry: _Entry) -> None:
+        if len(self._hot) >= self.hot_size:
+            victim = random.choice(self._hot_keys)
+            _, expiry, value = self._hot[victim]
+            self._remove_hot(victim)
+            self._cool(victim, (expiry, value))
+        self._hot[key] = [len(self._hot_keys), entry[0], entry[1]]
+        self._hot_keys.append(key)
+
+    def _cool(self, key: Hashable, entry: _Entry) -> None:
+        self._cooling[key] = entry
+        if len(self._cooling) > self.cooling_size:
+            self._cooling.popitem(last=False)
+
+    def _remove_hot(self, key: Hashable) -> None:
+        pos  = self._hot.pop(key)[0]
+        last = self._hot_keys.pop()
+        if last != key:
+            self._hot_keys[pos] = last
+            self._hot[last][0] = pos
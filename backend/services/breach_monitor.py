@@ -4,9 +4,11 @@ Real-time detection and tracking of risk limit breaches.
 """
 
 import logging
+from bisect import bisect_left, bisect_right
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta, date
+from datetime import datetime, date
 import hashlib
+import time
 
 from models.schemas import (
     BreachThreshold,
@@ -18,6 +20,29 @@ from models.schemas import (
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+_NS_PER_HOUR = 3600 * 1_000_000_000
+
+# Severity bands by % over threshold: <10 low, <25 medium, <50 high, else critical
+_SEVERITY_CUTS = (10.0, 25.0, 50.0)
+_SEVERITY_LABELS = ('low', 'medium', 'high', 'critical')
+
+# (PortfolioSummary attribute, metric key, optional transform)
+_METRIC_FIELDS = (
+    # VaR metrics
+    ('var_1d_95', 'var_95', None),
+    ('var_1d_99', 'var_99', None),
+    ('var_10d_95', 'var_10d_95', None),
+    ('var_10d_99', 'var_10d_99', None),
+    # ES metrics
+    ('expected_shortfall_95', 'es_95', None),
+    ('expected_shortfall_99', 'es_99', None),
+    # Portfolio metrics
+    ('total_value', 'total_value', None),
+    ('total_unrealized_pnl', 'unrealized_pnl', abs),
+)
+
 
 class BreachMonitor:
     """
@@ -34,7 +59,16 @@ class BreachMonitor:
         # In-memory storage (in production, use database)
         self._configs: Dict[str, BreachMonitorConfig] = {}
         self._breach_history: Dict[str, List[BreachEvent]] = {}
+        # Parallel wall-clock time_ns() lists; breaches are appended in time order
+        self._breach_ts: Dict[str, List[int]] = {}
+        # portfolio → metric → ascending indices into _breach_history
+        self._by_metric: Dict[str, Dict[str, List[int]]] = {}
+        self._breach_by_id: Dict[str, BreachEvent] = {}
         self._last_check: Dict[str, datetime] = {}
+        # Enabled thresholds per portfolio, refreshed whenever thresholds change
+        self._enabled_cache: Dict[str, List[BreachThreshold]] = {}
+        # portfolio → metric → threshold object (shared with config.thresholds)
+        self._thresholds_by_metric: Dict[str, Dict[str, BreachThreshold]] = {}
     
     def configure_monitoring(
         self,
@@ -63,14 +97,26 @@ class BreachMonitor:
         )
         
         self._configs[portfolio_id] = config
+        by_metric: Dict[str, BreachThreshold] = {}
+        for threshold in config.thresholds:
+            # First entry wins, matching the order update_threshold used to scan in
+            by_metric.setdefault(threshold.metric, threshold)
+        self._thresholds_by_metric[portfolio_id] = by_metric
+        self._refresh_enabled(portfolio_id)
         
         if portfolio_id not in self._breach_history:
             self._breach_history[portfolio_id] = []
+            self._breach_ts[portfolio_id] = []
+            self._by_metric[portfolio_id] = {}
         
         logger.info(f"Configured breach monitoring for portfolio {portfolio_id} with {len(thresholds)} thresholds")
         
         return config
     
+    def _refresh_enabled(self, portfolio_id: str):
+        config = self._configs[portfolio_id]
+        self._enabled_cache[portfolio_id] = [t for t in config.thresholds if t.enabled]
+    
     def get_config(self, portfolio_id: str) -> Optional[BreachMonitorConfig]:
         """Get breach monitoring configuration for a portfolio"""
         return self._configs.get(portfolio_id)
@@ -88,19 +134,24 @@ class BreachMonitor:
             raise ValueError(f"No configuration found for portfolio {portfolio_id}")
         
         # Find and update threshold
-        for threshold in config.thresholds:
-            if threshold.metric == metric:
-                threshold.threshold = new_threshold
-                threshold.enabled = enabled
-                logger.info(f"Updated {metric} threshold to {new_threshold} for portfolio {portfolio_id}")
-                return
+        by_metric = self._thresholds_by_metric[portfolio_id]
+        threshold = by_metric.get(metric)
+        if threshold is not None:
+            threshold.threshold = new_threshold
+            threshold.enabled = enabled
+            self._refresh_enabled(portfolio_id)
+            logger.info(f"Updated {metric} threshold to {new_threshold} for portfolio {portfolio_id}")
+            return
         
         # If not found, add new threshold
-        config.thresholds.append(BreachThreshold(
+        threshold = BreachThreshold(
             metric=metric,
             threshold=new_threshold,
             enabled=enabled
-        ))
+        )
+        config.thresholds.append(threshold)
+        by_metric[metric] = threshold
+        self._refresh_enabled(portfolio_id)
         logger.info(f"Added new {metric} threshold: {new_threshold} for portfolio {portfolio_id}")
     
     async def check_breaches(
@@ -125,15 +176,23 @@ class BreachMonitor:
         
         breaches = []
         current_time = datetime.utcnow()
+        current_ns = time.time_ns()
+        
+        enabled = self._enabled_cache.get(portfolio_id)
+        if not enabled:
+            self._last_check[portfolio_id] = current_time
+            return breaches
         
         # Extract metrics from portfolio summary
         metrics = self._extract_metrics(portfolio_summary)
         
-        # Check each threshold
-        for threshold in config.thresholds:
-            if not threshold.enabled:
-                continue
-            
+        # Breach ids hash "<portfolio>_<metric>_<timestamp>"; the ends are
+        # fixed for this check, so encode them once
+        id_prefix = f"{portfolio_id}_".encode()
+        id_suffix = f"_{current_time.isoformat()}".encode()
+        
+        # Check each enabled threshold
+        for threshold in enabled:
             metric_value = metrics.get(threshold.metric)
             if metric_value is None:
                 logger.warning(f"Metric {threshold.metric} not found in portfolio summary")
@@ -144,9 +203,9 @@ class BreachMonitor:
                 severity = self._calculate_severity(metric_value, threshold.threshold)
                 
                 # Create breach event
-                breach_id = hashlib.md5(
-                    f"{portfolio_id}_{threshold.metric}_{current_time.isoformat()}".encode()
-                ).hexdigest()[:16]
+                breach_id = hashlib.blake2b(
+                    id_prefix + threshold.metric.encode() + id_suffix, digest_size=8
+                ).hexdigest()
                 
                 breach = BreachEvent(
                     breach_id=breach_id,
@@ -161,14 +220,21 @@ class BreachMonitor:
                 
                 breaches.append(breach)
                 
-                # Add to history
-                self._breach_history[portfolio_id].append(breach)
-                
                 logger.warning(
                     f"BREACH DETECTED: {threshold.metric} = {metric_value:.2f} "
                     f"exceeds threshold {threshold.threshold:.2f} for portfolio {portfolio_id}"
                 )
         
+        # Add to history
+        if breaches:
+            history = self._breach_history[portfolio_id]
+            by_metric = self._by_metric[portfolio_id]
+            for idx, breach in enumerate(breaches, len(history)):
+                by_metric.setdefault(breach.metric, []).append(idx)
+            history.extend(breaches)
+            self._breach_ts[portfolio_id].extend([current_ns] * len(breaches))
+            self._breach_by_id.update((b.breach_id, b) for b in breaches)
+        
         # Update last check time
         self._last_check[portfolio_id] = current_time
         
@@ -182,32 +248,15 @@ class BreachMonitor:
         """Extract risk metrics from portfolio summary"""
         metrics = {}
         
-        # VaR metrics
-        if hasattr(portfolio_summary, 'var_1d_95'):
-            metrics['var_95'] = portfolio_summary.var_1d_95
-        if hasattr(portfolio_summary, 'var_1d_99'):
-            metrics['var_99'] = portfolio_summary.var_1d_99
-        if hasattr(portfolio_summary, 'var_10d_95'):
-            metrics['var_10d_95'] = portfolio_summary.var_10d_95
-        if hasattr(portfolio_summary, 'var_10d_99'):
-            metrics['var_10d_99'] = portfolio_summary.var_10d_99
-        
-        # ES metrics
-        if hasattr(portfolio_summary, 'expected_shortfall_95'):
-            metrics['es_95'] = portfolio_summary.expected_shortfall_95
-        if hasattr(portfolio_summary, 'expected_shortfall_99'):
-            metrics['es_99'] = portfolio_summary.expected_shortfall_99
-        
-        # Portfolio metrics
-        if hasattr(portfolio_summary, 'total_value'):
-            metrics['total_value'] = portfolio_summary.total_value
-        if hasattr(portfolio_summary, 'total_unrealized_pnl'):
-            metrics['unrealized_pnl'] = abs(portfolio_summary.total_unrealized_pnl)
+        for attr, key, transform in _METRIC_FIELDS:
+            value = getattr(portfolio_summary, attr, _MISSING)
+            if value is not _MISSING:
+                metrics[key] = transform(value) if transform else value
         
         # Drawdown
-        if hasattr(portfolio_summary, 'total_gain_loss_pct'):
-            if portfolio_summary.total_gain_loss_pct < 0:
-                metrics['drawdown'] = abs(portfolio_summary.total_gain_loss_pct)
+        gain_loss_pct = getattr(portfolio_summary, 'total_gain_loss_pct', _MISSING)
+        if gain_loss_pct is not _MISSING and gain_loss_pct < 0:
+            metrics['drawdown'] = abs(gain_loss_pct)
         
         return metrics
     
@@ -218,15 +267,7 @@ class BreachMonitor:
         Returns: 'low', 'medium', 'high', or 'critical'
         """
         excess_pct = ((actual_value - threshold) / threshold) * 100
-        
-        if excess_pct < 10:
-            return 'low'
-        elif excess_pct < 25:
-            return 'medium'
-        elif excess_pct < 50:
-            return 'high'
-        else:
-            return 'critical'
+        return _SEVERITY_LABELS[bisect_right(_SEVERITY_CUTS, excess_pct)]
     
     async def _send_breach_notifications(
         self,
@@ -241,6 +282,25 @@ class BreachMonitor:
         )
         # In production, call email service here
     
+    def _since(self, portfolio_id: str, hours: float) -> List[BreachEvent]:
+        """Breaches from the last `hours`, oldest first, located by bisection."""
+        cutoff = time.time_ns() - int(hours * _NS_PER_HOUR)
+        timestamps = self._breach_ts.get(portfolio_id)
+        if not timestamps:
+            return []
+        return self._breach_history[portfolio_id][bisect_left(timestamps, cutoff):]
+    
+    def _since_metric(self, portfolio_id: str, metric: str, hours: float) -> List[BreachEvent]:
+        """Like `_since`, but only walks the breaches recorded for `metric`."""
+        cutoff = time.time_ns() - int(hours * _NS_PER_HOUR)
+        indices = self._by_metric.get(portfolio_id, {}).get(metric)
+        if not indices:
+            return []
+        timestamps = self._breach_ts[portfolio_id]
+        history = self._breach_history[portfolio_id]
+        start = bisect_left(indices, cutoff, key=timestamps.__getitem__)
+        return [history[i] for i in indices[start:]]
+    
     def get_breach_history(
         self,
         portfolio_id: str,
@@ -258,26 +318,16 @@ class BreachMonitor:
         Returns:
             BreachHistory object
         """
-        all_breaches = self._breach_history.get(portfolio_id, [])
-        
-        # Filter by date
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-        recent_breaches = [
-            b for b in all_breaches
-            if b.timestamp >= cutoff_date
-        ]
-        
-        # Filter by metric if specified
+        # Filter by date, and by metric if specified
         if metric:
-            recent_breaches = [
-                b for b in recent_breaches
-                if b.metric == metric
-            ]
+            recent_breaches = self._since_metric(portfolio_id, metric, days * 24)
+        else:
+            recent_breaches = self._since(portfolio_id, days * 24)
         
-        # Calculate date range
+        # Calculate date range (history is in time order)
         if recent_breaches:
-            min_date = min(b.timestamp.date() for b in recent_breaches)
-            max_date = max(b.timestamp.date() for b in recent_breaches)
+            min_date = recent_breaches[0].timestamp.date()
+            max_date = recent_breaches[-1].timestamp.date()
         else:
             min_date = max_date = date.today()
         
@@ -290,23 +340,19 @@ class BreachMonitor:
     
     def acknowledge_breach(self, portfolio_id: str, breach_id: str):
         """Mark a breach as acknowledged"""
-        breaches = self._breach_history.get(portfolio_id, [])
-        for breach in breaches:
-            if breach.breach_id == breach_id:
-                breach.acknowledged = True
-                logger.info(f"Acknowledged breach {breach_id} for portfolio {portfolio_id}")
-                return
+        breach = self._breach_by_id.get(breach_id)
+        if breach is not None and breach.portfolio_id == portfolio_id:
+            breach.acknowledged = True
+            logger.info(f"Acknowledged breach {breach_id} for portfolio {portfolio_id}")
+            return
         
         logger.warning(f"Breach {breach_id} not found for portfolio {portfolio_id}")
     
     def get_current_breaches(self, portfolio_id: str) -> List[BreachEvent]:
         """Get unacknowledged breaches from the last 24 hours"""
-        all_breaches = self._breach_history.get(portfolio_id, [])
-        cutoff = datetime.utcnow() - timedelta(hours=24)
-        
         current = [
-            b for b in all_breaches
-            if b.timestamp >= cutoff and not b.acknowledged
+            b for b in self._since(portfolio_id, 24)
+            if not b.acknowledged
         ]
         
         return sorted(current, key=lambda x: x.timestamp, reverse=True)
@@ -314,8 +360,13 @@ class BreachMonitor:
     def clear_history(self, portfolio_id: str):
         """Clear breach history for a portfolio (admin function)"""
         if portfolio_id in self._breach_history:
-            count = len(self._breach_history[portfolio_id])
+            cleared = self._breach_history[portfolio_id]
+            count = len(cleared)
+            for breach in cleared:
+                self._breach_by_id.pop(breach.breach_id, None)
             self._breach_history[portfolio_id] = []
+            self._breach_ts[portfolio_id] = []
+            self._by_metric[portfolio_id] = {}
             logger.info(f"Cleared {count} breach events for portfolio {portfolio_id}")
 
 
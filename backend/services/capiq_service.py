@@ -4,11 +4,15 @@ Placeholder for Cap IQ API integration.
 """
 
 import logging
+import time
 from typing import List, Dict, Any, Optional
 from datetime import date
 
 logger = logging.getLogger(__name__)
 
+# Disabled-mode warnings are emitted at most once per method per interval
+_DISABLED_LOG_INTERVAL = 60.0
+
 
 class CapIQService:
     """
@@ -24,6 +28,7 @@ class CapIQService:
     def __init__(self):
         self.enabled = False
         self.api_key = None
+        self._disabled_logged_at: Dict[str, float] = {}
         logger.info("Cap IQ service initialized (stub mode - Phase 2)")
     
     def configure(self, api_key: str):
@@ -56,7 +61,7 @@ class CapIQService:
             Earnings data dictionary or None
         """
         if not self.enabled:
-            logger.warning("Cap IQ not enabled - returning None")
+            self._warn_disabled("get_earnings_data")
             return None
         
         # TODO: Implement Cap IQ API call
@@ -84,7 +89,7 @@ class CapIQService:
             List of board member dictionaries or None
         """
         if not self.enabled:
-            logger.warning("Cap IQ not enabled - returning None")
+            self._warn_disabled("get_board_members")
             return None
         
         # TODO: Implement Cap IQ API call
@@ -113,7 +118,7 @@ class CapIQService:
             Dictionary of metric values or None
         """
         if not self.enabled:
-            logger.warning("Cap IQ not enabled - returning None")
+            self._warn_disabled("get_financial_metrics")
             return None
         
         # TODO: Implement Cap IQ API call
@@ -146,7 +151,7 @@ class CapIQService:
             Enhanced 10-K data dictionary or None
         """
         if not self.enabled:
-            logger.warning("Cap IQ not enabled - returning None")
+            self._warn_disabled("enhance_10k_data")
             return None
         
         # TODO: Implement Cap IQ API call
@@ -180,7 +185,7 @@ class CapIQService:
             EaR calculation results or None
         """
         if not self.enabled:
-            logger.warning("Cap IQ not enabled - returning None")
+            self._warn_disabled("calculate_earnings_at_risk")
             return None
         
         # TODO: Implement EaR calculation with Cap IQ data
@@ -193,6 +198,17 @@ class CapIQService:
             "message": "EaR calculation requires Cap IQ data (Phase 2)"
         }
     
+    def _warn_disabled(self, method: str) -> None:
+        """Log the disabled-mode warning, throttled per method"""
+        if not logger.isEnabledFor(logging.WARNING):
+            return
+        now = time.monotonic()
+        last = self._disabled_logged_at.get(method)
+        if last is not None and now - last < _DISABLED_LOG_INTERVAL:
+            return
+        self._disabled_logged_at[method] = now
+        logger.warning("Cap IQ not enabled - %s returning None", method)
+
     def is_available(self) -> bool:
         """Check if Cap IQ service is available"""
         return self.enabled
@@ -3,13 +3,32 @@ Clara — COSO Framework Classifier
 Classifies risks into COSO Enterprise Risk Management categories.
 """
 
+import asyncio
 import logging
+from operator import itemgetter
 from typing import List, Dict, Any
-from models.schemas import COSOCategory
+
+import numpy as np
+
+from models.schemas import COSOCategory, COSO_CATEGORY_BY_VALUE
 from services.watsonx_service import watsonx_service
 
 logger = logging.getLogger(__name__)
 
+# Enum members and their string values, frozen once; index-aligned with the
+# classifier's keyword table
+_CAT_LIST = tuple(COSOCategory)
+_CAT_VALUE: Dict[COSOCategory, str] = {cat: cat.value for cat in _CAT_LIST}
+_CAT_VALUES = tuple(_CAT_VALUE[cat] for cat in _CAT_LIST)
+_CAT_DEFAULT = _CAT_VALUE[COSOCategory.OPERATIONAL]
+
+_CATEGORY_DESCRIPTIONS = {
+    COSOCategory.STRATEGIC: "Strategic risks affecting market position, competition, innovation, and business model",
+    COSOCategory.OPERATIONAL: "Operational risks related to processes, systems, people, and business continuity",
+    COSOCategory.FINANCIAL: "Financial risks including credit, liquidity, market risk, and capital adequacy",
+    COSOCategory.COMPLIANCE: "Compliance risks from regulatory, legal, tax, and environmental requirements"
+}
+
 
 class COSOClassifier:
     """
@@ -24,6 +43,13 @@ class COSOClassifier:
     
     def __init__(self):
         self.taxonomy = self._build_taxonomy()
+        # Matching table in COSOCategory order. Text is lowercased before
+        # matching, so mixed-case keywords (e.g. 'M&A') can never hit and
+        # are left out.
+        self._keyword_table = tuple(
+            (cat, tuple(k for k in self.taxonomy.get(cat, ()) if k == k.lower()))
+            for cat in _CAT_LIST
+        )
     
     def _build_taxonomy(self) -> Dict[str, List[str]]:
         """Build keyword taxonomy for each COSO category"""
@@ -120,82 +146,93 @@ class COSOClassifier:
         Returns:
             List of applicable COSO categories
         """
-        text_lower = risk_text.lower()
-        category_scores = {cat: 0 for cat in COSOCategory}
+        nonzero = [(score, j) for j, score in enumerate(self._keyword_scores(risk_text)) if score]
         
-        # Score each category based on keyword matches
-        for category, keywords in self.taxonomy.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    category_scores[category] += 1
+        # Zero or one matching category needs no ranking
+        if len(nonzero) <= 1:
+            return [_CAT_VALUES[nonzero[0][1]] if nonzero else _CAT_DEFAULT]
         
-        # Return categories with at least one match
-        matched_categories = [
-            cat.value for cat, score in category_scores.items() if score > 0
-        ]
+        # Top 2 by score; the sort is stable, so ties keep COSOCategory order
+        nonzero.sort(key=itemgetter(0), reverse=True)
+        return [_CAT_VALUES[j] for _, j in nonzero[:2]]
+    
+    def _keyword_scores(self, risk_text: str) -> List[int]:
+        """Number of each category's keywords present, in COSOCategory order."""
+        contains = risk_text.lower().__contains__
+        return [sum(map(contains, keywords)) for _, keywords in self._keyword_table]
+    
+    def _keyword_classification_batch(self, risk_texts: List[str]) -> List[List[str]]:
+        """
+        Keyword-based COSO classification for many texts at once.
         
-        # If no matches, default to operational
-        if not matched_categories:
-            return [COSOCategory.OPERATIONAL.value]
+        Each category scores the number of its keywords present in the text;
+        a text gets its top 2 categories with a non-zero score (ties keep
+        COSOCategory order), or operational if nothing matched.
         
-        # If multiple matches, return top 2 by score
-        sorted_cats = sorted(
-            category_scores.items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )
+        Args:
+            risk_texts: List of risk statement texts
+            
+        Returns:
+            List of category lists (one per risk)
+        """
+        scores = np.zeros((len(risk_texts), len(_CAT_LIST)), dtype=np.int32)
+        for i, risk_text in enumerate(risk_texts):
+            scores[i] = self._keyword_scores(risk_text)
         
-        top_categories = [
-            cat.value for cat, score in sorted_cats[:2] if score > 0
-        ]
+        top2 = np.argsort(-scores, axis=1, kind="stable")[:, :2]
+        hits = np.take_along_axis(scores, top2, axis=1) > 0
         
-        return top_categories if top_categories else [COSOCategory.OPERATIONAL.value]
+        return [
+            [_CAT_VALUES[j] for j, hit in zip(row, row_hits) if hit] or [_CAT_DEFAULT]
+            for row, row_hits in zip(top2.tolist(), hits.tolist())
+        ]
     
     async def classify_batch(
         self, 
         risk_texts: List[str], 
-        use_watson: bool = True
+        use_watson: bool = True,
+        concurrency: int = 8
     ) -> List[List[str]]:
         """
-        Classify multiple risk statements.
+        Classify multiple risk statements concurrently.
         
         Args:
             risk_texts: List of risk statement texts
             use_watson: Whether to use Watson AI
+            concurrency: Maximum classifications (Watson calls) in flight
             
         Returns:
             List of category lists (one per risk)
         """
-        results = []
-        for risk_text in risk_texts:
-            categories = await self.classify_risk(risk_text, use_watson)
-            results.append(categories)
-        return results
+        if not (use_watson and watsonx_service.enabled):
+            return self._keyword_classification_batch(risk_texts)
+        
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def _one(risk_text: str) -> List[str]:
+            async with sem:
+                return await self.classify_risk(risk_text, use_watson)
+        
+        results = await asyncio.gather(*(_one(t) for t in risk_texts), return_exceptions=True)
+        return [
+            self._keyword_classification(risk_text) if isinstance(result, Exception) else result
+            for risk_text, result in zip(risk_texts, results)
+        ]
     
     def get_category_description(self, category: str) -> str:
         """Get human-readable description of a COSO category"""
-        descriptions = {
-            COSOCategory.STRATEGIC: "Strategic risks affecting market position, competition, innovation, and business model",
-            COSOCategory.OPERATIONAL: "Operational risks related to processes, systems, people, and business continuity",
-            COSOCategory.FINANCIAL: "Financial risks including credit, liquidity, market risk, and capital adequacy",
-            COSOCategory.COMPLIANCE: "Compliance risks from regulatory, legal, tax, and environmental requirements"
-        }
-        
-        try:
-            cat_enum = COSOCategory(category.lower())
-            return descriptions.get(cat_enum, "Unknown category")
-        except ValueError:
-            return "Unknown category"
+        cat_enum = COSO_CATEGORY_BY_VALUE.get(category.lower())
+        return _CATEGORY_DESCRIPTIONS.get(cat_enum, "Unknown category")
     
     def get_all_categories(self) -> List[Dict[str, str]]:
         """Get all COSO categories with descriptions"""
         return [
             {
-                "value": cat.value,
-                "label": cat.value.capitalize(),
-                "description": self.get_category_description(cat.value)
+                "value": value,
+                "label": value.capitalize(),
+                "description": _CATEGORY_DESCRIPTIONS[cat]
             }
-            for cat in COSOCategory
+            for cat, value in _CAT_VALUE.items()
         ]
 
 
@@ -0,0 +1,102 @@
+"""
+CLARA — Email Group Commit
+Collects outgoing emails from concurrent alert tasks and hands them to the
+delivery function in batches, so a trigger wave shares one provider session
+instead of paying a full round-trip per message.
+
+A batch is flushed once it holds `max_batch` messages or `max_wait` seconds
+after its first message arrived, whichever comes first.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+logger = logging.getLogger("CLARA.email_batcher")
+
+_Pending = Tuple[Any, "asyncio.Future[Any]"]
+
+
+class EmailBatcher:
+    """
+    Queue + single consumer task. `deliver` receives a list of messages and
+    must return one result per message, in the same order.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch: int = 32,
+        max_wait: float = 0.2,
+    ) -> None:
+        self._deliver  = deliver
+        self.max_batch = max_batch
+        self.max_wait  = max_wait
+        self._queue: Optional["asyncio.Queue[_Pending]"] = None
+        self._consumer: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, message: Any) -> Any:
+        """Queue a message and wait for its delivery result."""
+        loop = asyncio.get_running_loop()
+        if self._consumer is None or self._consumer.done() or self._loop is not loop:
+            # First use, or the previous consumer belonged to another event loop
+            self._loop     = loop
+            self._queue    = asyncio.Queue()
+            self._consumer = loop.create_task(self._run(self._queue))
+        future: "asyncio.Future[Any]" = loop.create_future()
+        self._queue.put_nowait((message, future))
+        return await future
+
+    async def aclose(self) -> None:
+        """Stop the consumer and cancel anything still queued."""
+        consumer, queue = self._consumer, self._queue
+        self._consumer = self._queue = self._loop = None
+        if consumer is not None and not consumer.done():
+            consumer.cancel()
+            try:
+                await consumer
+            except asyncio.CancelledError:
+                pass
+        while queue is not None and not queue.empty():
+            queue.get_nowait()[1].cancel()
+
+    # ── Consumer ─────────────────────────────────────────────────────────────
+
+    async def _run(self, queue: "asyncio.Queue[_Pending]") -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[_Pending]) -> None:
+        futures = [future for _, future in batch]
+        try:
+            results = await self._deliver([message for message, _ in batch])
+        except asyncio.CancelledError:
+            for future in futures:
+                future.cancel()
+            raise
+        except Exception as exc:
+            logger.error("Email batch of %d failed: %s", len(batch), exc)
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        logger.debug("Flushed email batch of %d", len(batch))
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
@@ -10,19 +10,26 @@ Priority:
 Templates are rendered as HTML with a professional dark-themed design.
 """
 
+import asyncio
 import logging
 import smtplib
 import uuid
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
 
 from config import settings
 from models.schemas import AlertLogEntry, AlertType
+from services.email_batcher import EmailBatcher
 
 logger = logging.getLogger("CLARA.email")
 
+_Message  = Tuple[str, str, str]                  # (to_email, subject, html_body)
+_Delivery = Tuple[bool, Optional[str], str]       # (sent, error, provider_used)
+
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
@@ -224,6 +231,21 @@ def _build_html_email(
 # SEND VIA SENDGRID
 # ══════════════════════════════════════════════════════════════════════════════
 
+_SENDGRID_URL = "https://api.sendgrid.com/v3/mail/send"
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http() -> httpx.AsyncClient:
+    """Pooled keep-alive client, so a batch of sends shares warm connections."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=8, keepalive_expiry=30.0),
+        )
+    return _client
+
+
 async def _send_sendgrid(
     to_email: str,
     subject: str,
@@ -231,7 +253,6 @@ async def _send_sendgrid(
 ) -> Tuple[bool, Optional[str]]:
     """Send email via SendGrid API."""
     try:
-        import httpx
         payload = {
             "personalizations": [{"to": [{"email": to_email}]}],
             "from": {
@@ -241,22 +262,21 @@ async def _send_sendgrid(
             "subject": subject,
             "content": [{"type": "text/html", "value": html_body}],
         }
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(
-                "https://api.sendgrid.com/v3/mail/send",
-                json=payload,
-                headers={
-                    "Authorization": f"Bearer {settings.SENDGRID_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-            )
-            if resp.status_code in (200, 202):
-                logger.info("Email sent via SendGrid to %s", to_email)
-                return True, None
-            else:
-                err = f"SendGrid HTTP {resp.status_code}: {resp.text[:200]}"
-                logger.error(err)
-                return False, err
+        resp = await _http().post(
+            _SENDGRID_URL,
+            json=payload,
+            headers={
+                "Authorization": f"Bearer {settings.SENDGRID_API_KEY}",
+                "Content-Type": "application/json",
+            },
+        )
+        if resp.status_code in (200, 202):
+            logger.info("Email sent via SendGrid to %s", to_email)
+            return True, None
+        else:
+            err = f"SendGrid HTTP {resp.status_code}: {resp.text[:200]}"
+            logger.error(err)
+            return False, err
     except Exception as exc:
         err = f"SendGrid exception: {exc}"
         logger.error(err)
@@ -267,38 +287,80 @@ async def _send_sendgrid(
 # SEND VIA SMTP
 # ══════════════════════════════════════════════════════════════════════════════
 
-def _send_smtp_sync(
-    to_email: str,
-    subject: str,
-    html_body: str,
-) -> Tuple[bool, Optional[str]]:
-    """Send email via SMTP (synchronous — run in thread executor)."""
+def _send_smtp_batch_sync(messages: List[_Message]) -> List[Tuple[bool, Optional[str]]]:
+    """Send emails over one SMTP session (synchronous — run in a worker thread)."""
     try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"]    = f"{settings.SENDGRID_FROM_NAME} <{settings.SMTP_USERNAME}>"
-        msg["To"]      = to_email
-        msg.attach(MIMEText(html_body, "html"))
-
         server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
+    except Exception as exc:
+        err = f"SMTP error: {exc}"
+        logger.error(err)
+        return [(False, err)] * len(messages)
+
+    results: List[Tuple[bool, Optional[str]]] = []
+    try:
         if settings.SMTP_USE_TLS:
             server.starttls()
         server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-        server.sendmail(settings.SMTP_USERNAME, to_email, msg.as_string())
-        server.quit()
-        logger.info("Email sent via SMTP to %s", to_email)
-        return True, None
+        for to_email, subject, html_body in messages:
+            try:
+                msg = MIMEMultipart("alternative")
+                msg["Subject"] = subject
+                msg["From"]    = f"{settings.SENDGRID_FROM_NAME} <{settings.SMTP_USERNAME}>"
+                msg["To"]      = to_email
+                msg.attach(MIMEText(html_body, "html"))
+                server.sendmail(settings.SMTP_USERNAME, to_email, msg.as_string())
+                logger.info("Email sent via SMTP to %s", to_email)
+                results.append((True, None))
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as exc:
+                err = f"SMTP error: {exc}"
+                logger.error(err)
+                results.append((False, err))
     except Exception as exc:
         err = f"SMTP error: {exc}"
         logger.error(err)
-        return False, err
+        results += [(False, err)] * (len(messages) - len(results))
+    finally:
+        try:
+            server.quit()
+        except Exception:
+            pass
+    return results
 
 
-import asyncio
+# ══════════════════════════════════════════════════════════════════════════════
+# BATCHED DELIVERY
+# ══════════════════════════════════════════════════════════════════════════════
+
+async def _deliver_batch(messages: List[_Message]) -> List[_Delivery]:
+    """
+    Deliver one batch with the same provider priority as a single send:
+    SendGrid first, then SMTP for whatever SendGrid did not accept.
+    """
+    results: List[_Delivery] = [(False, None, "none")] * len(messages)
+
+    if _sendgrid_configured():
+        outcomes = await asyncio.gather(*(_send_sendgrid(*m) for m in messages))
+        results  = [(sent, err, "sendgrid") for sent, err in outcomes]
+
+    retry = [i for i, (sent, _, _) in enumerate(results) if not sent]
+    if retry and _smtp_configured():
+        outcomes = await asyncio.to_thread(_send_smtp_batch_sync, [messages[i] for i in retry])
+        for i, (sent, err) in zip(retry, outcomes):
+            results[i] = (sent, err, "smtp")
+
+    return results
+
+
+email_batcher = EmailBatcher(_deliver_batch)
 
-async def _send_smtp(to_email: str, subject: str, html_body: str) -> Tuple[bool, Optional[str]]:
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, _send_smtp_sync, to_email, subject, html_body)
+
+async def aclose() -> None:
+    """Stop the batch consumer and close the pooled SendGrid client."""
+    global _client
+    await email_batcher.aclose()
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -330,17 +392,8 @@ async def send_alert_email(
         avg_cost, shares, gain_loss, gain_loss_pct, portfolio_value, action_message,
     )
 
-    sent          = False
-    error_msg: Optional[str] = None
-    provider_used = "none"
-
-    if _sendgrid_configured():
-        sent, error_msg = await _send_sendgrid(to_email, subject, html)
-        provider_used = "sendgrid"
-
-    if not sent and _smtp_configured():
-        sent, error_msg = await _send_smtp(to_email, subject, html)
-        provider_used = "smtp"
+    # Concurrent alerts are grouped and delivered together (see _deliver_batch)
+    sent, error_msg, provider_used = await email_batcher.submit((to_email, subject, html))
 
     if not sent:
         if not error_msg:
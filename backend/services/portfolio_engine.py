@@ -15,6 +15,8 @@ import random
 import logging
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 from models.schemas import (
     EnrichedPosition, PortfolioPosition, PortfolioSummary,
     BuyRecommendation, RiskLevel, VaRResult, MonteCarloResult, RiskContributor,
@@ -250,23 +252,21 @@ def compute_risk_contributors(positions: List[EnrichedPosition]) -> List[RiskCon
     if not total_value:
         return []
 
-    contribs = []
-    for p in positions:
-        # Marginal VaR ≈ weight × beta × portfolio_vol × z_95
-        weight   = p.market_value / total_value
-        m_var    = round(p.market_value * 0.0126 * p.beta * 1.645, 2)
-        contribs.append(RiskContributor(
+    # Marginal VaR ≈ weight × beta × portfolio_vol × z_95
+    m_vars     = [round(p.market_value * 0.0126 * p.beta * 1.645, 2) for p in positions]
+    total_mvar = sum(m_vars) or 1
+
+    contribs = [
+        RiskContributor(
             symbol=p.symbol,
             company=p.company,
             marginal_var=m_var,
             component_var=m_var,
-            pct_of_total=0.0,
+            pct_of_total=round(m_var / total_mvar * 100, 1),
             beta=p.beta,
-        ))
-
-    total_mvar = sum(c.marginal_var for c in contribs) or 1
-    for c in contribs:
-        c.pct_of_total = round(c.marginal_var / total_mvar * 100, 1)
+        )
+        for p, m_var in zip(positions, m_vars)
+    ]
 
     return sorted(contribs, key=lambda x: x.marginal_var, reverse=True)
 
@@ -275,6 +275,15 @@ def compute_risk_contributors(positions: List[EnrichedPosition]) -> List[RiskCon
 # MONTE CARLO
 # ══════════════════════════════════════════════════════════════════════════════
 
+def _simulate_pnl(total_value: float, daily_vol: float, n_paths: int) -> np.ndarray:
+    """Draw n_paths 1-day P&L outcomes and return them sorted ascending."""
+    rng = np.random.default_rng()
+    pnl = rng.normal(0.0, daily_vol, n_paths)
+    pnl *= total_value
+    pnl.sort()
+    return pnl
+
+
 def run_monte_carlo(
     positions: List[EnrichedPosition], n_paths: int = 10_000
 ) -> MonteCarloResult:
@@ -286,40 +295,36 @@ def run_monte_carlo(
     portfolio_beta = sum(p.beta * p.market_value for p in positions) / total_value if total_value else 1.0
     daily_vol     = 0.0126 * portfolio_beta
 
-    # Simulate n_paths 1-day P&L
-    pnl_list = [
-        total_value * random.gauss(0, daily_vol)
-        for _ in range(n_paths)
-    ]
-    pnl_list.sort()
+    # Simulate n_paths 1-day P&L (sorted)
+    pnl = _simulate_pnl(total_value, daily_vol, n_paths)
 
     var_idx_95 = int(n_paths * 0.05)
     var_idx_99 = int(n_paths * 0.01)
-    var_95     = -pnl_list[var_idx_95]
-    var_99     = -pnl_list[var_idx_99]
-    es_95      = -sum(pnl_list[:var_idx_95]) / var_idx_95 if var_idx_95 else var_95
+    var_95     = -float(pnl[var_idx_95])
+    var_99     = -float(pnl[var_idx_99])
+    es_95      = -float(pnl[:var_idx_95].mean()) if var_idx_95 else var_95
 
-    mean_ret = sum(pnl_list) / len(pnl_list)
-    std_dev  = math.sqrt(sum((x - mean_ret) ** 2 for x in pnl_list) / len(pnl_list))
+    mean_ret = float(pnl.mean())
+    std_dev  = float(pnl.std())
 
-    # Histogram buckets
-    min_pnl = pnl_list[0]
-    max_pnl = pnl_list[-1]
+    # Histogram buckets — [lo, hi) counts via binary search on the sorted draws
+    min_pnl = float(pnl[0])
+    max_pnl = float(pnl[-1])
     buckets  = 30
     width    = (max_pnl - min_pnl) / buckets if max_pnl != min_pnl else 1
-    histogram: List[Dict[str, Any]] = []
-    for i in range(buckets):
-        lo = min_pnl + i * width
-        hi = lo + width
-        count = sum(1 for x in pnl_list if lo <= x < hi)
-        histogram.append({"bucket": round((lo + hi) / 2, 0), "count": count})
+    edges    = min_pnl + np.arange(buckets + 1) * width
+    counts   = np.diff(np.searchsorted(pnl, edges, side="left"))
+    mids     = np.round((edges[:-1] + edges[1:]) / 2, 0)
+    histogram: List[Dict[str, Any]] = [
+        {"bucket": float(mid), "count": int(count)} for mid, count in zip(mids, counts)
+    ]
 
     # Convergence — how VaR estimate stabilizes as paths increase
-    convergence = []
-    for step in range(100, n_paths + 1, max(1, n_paths // 20)):
-        sub = pnl_list[:step]
-        sub_var = -sub[int(step * 0.05)]
-        convergence.append({"paths": step, "var_95": round(sub_var, 0)})
+    steps = np.arange(100, n_paths + 1, max(1, n_paths // 20))
+    sub_vars = -pnl[(steps * 0.05).astype(np.int64)]
+    convergence = [
+        {"paths": int(step), "var_95": round(float(v), 0)} for step, v in zip(steps, sub_vars)
+    ]
 
     return MonteCarloResult(
         paths=n_paths,
@@ -328,8 +333,8 @@ def run_monte_carlo(
         var_95=round(var_95, 2),
         var_99=round(var_99, 2),
         expected_shortfall=round(es_95, 2),
-        max_loss=round(-pnl_list[0], 2),
-        max_gain=round(pnl_list[-1], 2),
+        max_loss=round(-min_pnl, 2),
+        max_gain=round(max_pnl, 2),
         histogram=histogram,
         convergence=convergence,
     )
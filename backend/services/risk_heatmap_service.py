@@ -4,12 +4,35 @@ Generates heat map data for risk visualization (likelihood × impact).
 """
 
 import logging
-from typing import List, Dict, Any
+from typing import Any, Collection, Dict, List
 import hashlib
+
+import numpy as np
+
 from models.schemas import TenKRiskFactor, HeatMapPoint, HeatMapData
 
 logger = logging.getLogger(__name__)
 
+# Likelihood indicators
+_HIGH_LIKELIHOOD_KEYWORDS = (
+    'likely', 'probable', 'expected', 'anticipated', 'ongoing',
+    'continue', 'persistent', 'recurring', 'frequent'
+)
+_LOW_LIKELIHOOD_KEYWORDS = (
+    'unlikely', 'remote', 'rare', 'potential', 'possible',
+    'could', 'might', 'may'
+)
+
+# Impact indicators
+_HIGH_IMPACT_KEYWORDS = (
+    'material', 'significant', 'substantial', 'severe', 'critical',
+    'major', 'adversely affect', 'materially adversely', 'harm',
+    'damage', 'loss', 'failure', 'bankruptcy', 'default'
+)
+_LOW_IMPACT_KEYWORDS = (
+    'minor', 'limited', 'minimal', 'slight', 'modest'
+)
+
 
 class RiskHeatMapService:
     """Service for generating risk heat map visualizations"""
@@ -59,58 +82,48 @@ class RiskHeatMapService:
         Returns:
             Tuple of (likelihood, impact) both in range 0-1
         """
-        text_lower = risk_text.lower()
-        
-        # Likelihood indicators
-        high_likelihood_keywords = [
-            'likely', 'probable', 'expected', 'anticipated', 'ongoing',
-            'continue', 'persistent', 'recurring', 'frequent'
-        ]
-        low_likelihood_keywords = [
-            'unlikely', 'remote', 'rare', 'potential', 'possible',
-            'could', 'might', 'may'
-        ]
-        
-        # Impact indicators
-        high_impact_keywords = [
-            'material', 'significant', 'substantial', 'severe', 'critical',
-            'major', 'adversely affect', 'materially adversely', 'harm',
-            'damage', 'loss', 'failure', 'bankruptcy', 'default'
-        ]
-        low_impact_keywords = [
-            'minor', 'limited', 'minimal', 'slight', 'modest'
-        ]
-        
-        # Calculate likelihood score
-        likelihood_score = 0.5  # Default to medium
-        high_likelihood_count = sum(1 for kw in high_likelihood_keywords if kw in text_lower)
-        low_likelihood_count = sum(1 for kw in low_likelihood_keywords if kw in text_lower)
-        
-        if high_likelihood_count > low_likelihood_count:
-            likelihood_score = min(0.5 + (high_likelihood_count * 0.1), 0.9)
-        elif low_likelihood_count > high_likelihood_count:
-            likelihood_score = max(0.5 - (low_likelihood_count * 0.1), 0.2)
-        
-        # Calculate impact score
-        impact_score = 0.5  # Default to medium
-        high_impact_count = sum(1 for kw in high_impact_keywords if kw in text_lower)
-        low_impact_count = sum(1 for kw in low_impact_keywords if kw in text_lower)
+        likelihood, impact = self.estimate_likelihood_impact_batch([risk_text])[0].tolist()
+        return likelihood, impact
+    
+    def estimate_likelihood_impact_batch(self, risk_texts: List[str]) -> np.ndarray:
+        """
+        Score many risk statements in one pass.
         
-        if high_impact_count > low_impact_count:
-            impact_score = min(0.5 + (high_impact_count * 0.1), 0.95)
-        elif low_impact_count > high_impact_count:
-            impact_score = max(0.5 - (low_impact_count * 0.1), 0.2)
+        Keyword counting stays per text; the scoring rules, jitter and clamping
+        run as array operations over all of them.
         
-        # Add some randomness to avoid clustering (±10%)
-        import random
-        likelihood_score += random.uniform(-0.05, 0.05)
-        impact_score += random.uniform(-0.05, 0.05)
+        Args:
+            risk_texts: Risk statement texts
+            
+        Returns:
+            (N, 2) array of (likelihood, impact) rows, both in range 0-1
+        """
+        rows = []
+        for risk_text in risk_texts:
+            text_lower = risk_text.lower()
+            rows.append((
+                sum(kw in text_lower for kw in _HIGH_LIKELIHOOD_KEYWORDS),
+                sum(kw in text_lower for kw in _LOW_LIKELIHOOD_KEYWORDS),
+                sum(kw in text_lower for kw in _HIGH_IMPACT_KEYWORDS),
+                sum(kw in text_lower for kw in _LOW_IMPACT_KEYWORDS),
+            ))
+        counts = np.array(rows, dtype=np.float64).reshape(-1, 4)
+        high_l, low_l, high_i, low_i = counts.T
         
-        # Clamp to valid range
-        likelihood_score = max(0.1, min(0.95, likelihood_score))
-        impact_score = max(0.1, min(0.95, impact_score))
+        # Medium (0.5) by default, nudged 0.1 per net keyword toward the bounds
+        likelihood = np.where(
+            high_l > low_l, np.minimum(0.5 + high_l * 0.1, 0.9),
+            np.where(low_l > high_l, np.maximum(0.5 - low_l * 0.1, 0.2), 0.5),
+        )
+        impact = np.where(
+            high_i > low_i, np.minimum(0.5 + high_i * 0.1, 0.95),
+            np.where(low_i > high_i, np.maximum(0.5 - low_i * 0.1, 0.2), 0.5),
+        )
         
-        return likelihood_score, impact_score
+        # Add some randomness to avoid clustering (±5 points), then clamp
+        scores = np.column_stack((likelihood, impact))
+        scores += np.random.default_rng().uniform(-0.05, 0.05, scores.shape)
+        return np.clip(scores, 0.1, 0.95)
     
     def generate_heat_map(
         self, 
@@ -138,9 +151,16 @@ class RiskHeatMapService:
         points = []
         zone_counts = {"low": 0, "medium": 0, "high": 0}
         
-        for risk in risks:
+        estimates = (
+            self.estimate_likelihood_impact_batch([risk.risk_text for risk in risks]).tolist()
+            if auto_estimate else None
+        )
+        
+        for idx, risk in enumerate(risks):
             # Use provided likelihood/impact or estimate
-            if auto_estimate or risk.likelihood == 0.5:
+            if estimates is not None:
+                likelihood, impact = estimates[idx]
+            elif risk.likelihood == 0.5:
                 likelihood, impact = self.estimate_likelihood_impact(risk.risk_text)
             else:
                 likelihood = risk.likelihood
@@ -177,14 +197,14 @@ class RiskHeatMapService:
     def filter_by_coso(
         self, 
         heat_map_data: HeatMapData, 
-        categories: List[str]
+        categories: Collection[str]
     ) -> HeatMapData:
         """
         Filter heat map data by COSO categories.
         
         Args:
             heat_map_data: Original heat map data
-            categories: List of COSO categories to include
+            categories: COSO categories to include (a set keeps lookups O(1))
             
         Returns:
             Filtered HeatMapData
@@ -6,7 +6,7 @@ Fetches and parses 10-K filings from SEC EDGAR API.
 import httpx
 import re
 import logging
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime, date
 from bs4 import BeautifulSoup
 import asyncio
@@ -16,6 +16,20 @@ from models.schemas import TenKFiling, TenKRiskFactor
 
 logger = logging.getLogger(__name__)
 
+# Item 1A paragraph heuristics, tried in order (compiled once)
+_RISK_PATTERNS = (
+    re.compile(r'(?:^|\. )([A-Z][^.]{20,}(?:risk|could|may|might|uncertain)[^.]{20,}\.)', re.MULTILINE),
+    re.compile(r'(?:^|\n)([A-Z][^\n]{50,}\.)', re.MULTILINE),
+)
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# compare_filings errors, in pipeline order (fetch → download → parse)
+_COMPARE_ERRORS = (
+    "Could not fetch one or both filings",
+    "Could not download filing HTML",
+    "Could not parse risk factors",
+)
+
 
 class SECEdgarService:
     """Service for fetching and parsing SEC EDGAR 10-K filings"""
@@ -340,13 +354,8 @@ class SECEdgarService:
             
             # Strategy 1: Look for common risk headers/patterns
             # Many companies use headers like "We may...", "Our business...", "If we...", etc.
-            risk_patterns = [
-                r'(?:^|\. )([A-Z][^.]{20,}(?:risk|could|may|might|uncertain)[^.]{20,}\.)',
-                r'(?:^|\n)([A-Z][^\n]{50,}\.)',
-            ]
-            
-            for pattern in risk_patterns:
-                matches = re.findall(pattern, item_1a_text, re.MULTILINE)
+            for pattern in _RISK_PATTERNS:
+                matches = pattern.findall(item_1a_text)
                 if matches and len(matches) > 3:
                     paragraphs = [m.strip() for m in matches if len(m.strip()) > 100]
                     if paragraphs:
@@ -355,7 +364,7 @@ class SECEdgarService:
             # Strategy 2: Split by sentence boundaries if we have long text
             if not paragraphs and len(item_1a_text) > 2000:
                 # Split into chunks of ~500-1000 characters at sentence boundaries
-                sentences = re.split(r'(?<=[.!?])\s+', item_1a_text)
+                sentences = _SENTENCE_SPLIT.split(item_1a_text)
                 current_chunk = ""
                 for sentence in sentences:
                     if len(current_chunk) + len(sentence) < 1000:
@@ -385,6 +394,25 @@ class SECEdgarService:
             logger.error(f"Error extracting risk paragraphs: {e}")
             return []
     
+    async def _risk_text_for_year(self, ticker: str, year: int) -> Tuple[int, Optional[str]]:
+        """
+        Fetch, download and parse one year's Item 1A for compare_filings.
+        
+        Returns:
+            (stage, text): stage indexes _COMPARE_ERRORS for the step that
+            failed, or is len(_COMPARE_ERRORS) with the text on success
+        """
+        filing = await self.fetch_10k_filing(ticker, year)
+        if not filing:
+            return 0, None
+        html = await self.download_filing_html(filing)
+        if not html:
+            return 1, None
+        text = await self.parse_risk_factors(html)
+        if not text:
+            return 2, None
+        return len(_COMPARE_ERRORS), text
+    
     async def compare_filings(
         self, 
         ticker: str, 
@@ -403,34 +431,17 @@ class SECEdgarService:
             Comparison dictionary with new/removed/changed risks
         """
         try:
-            # Fetch both filings
-            filing1 = await self.fetch_10k_filing(ticker, year1)
-            filing2 = await self.fetch_10k_filing(ticker, year2)
-            
-            if not filing1 or not filing2:
-                return {
-                    "error": "Could not fetch one or both filings",
-                    "year1": year1,
-                    "year2": year2
-                }
-            
-            # Download and parse both
-            html1 = await self.download_filing_html(filing1)
-            html2 = await self.download_filing_html(filing2)
-            
-            if not html1 or not html2:
-                return {
-                    "error": "Could not download filing HTML",
-                    "year1": year1,
-                    "year2": year2
-                }
-            
-            text1 = await self.parse_risk_factors(html1)
-            text2 = await self.parse_risk_factors(html2)
-            
-            if not text1 or not text2:
+            # Fetch → download → parse both years concurrently
+            (stage1, text1), (stage2, text2) = await asyncio.gather(
+                self._risk_text_for_year(ticker, year1),
+                self._risk_text_for_year(ticker, year2),
+            )
+            
+            # Report the earliest stage at which either filing failed
+            failed = min(stage1, stage2)
+            if failed < len(_COMPARE_ERRORS):
                 return {
-                    "error": "Could not parse risk factors",
+                    "error": _COMPARE_ERRORS[failed],
                     "year1": year1,
                     "year2": year2
                 }
@@ -231,7 +231,7 @@ async def get_quote(symbol: str) -> Dict[str, Any]:
     Cascade: Alpha Vantage → Yahoo Finance → Twelve Data → Simulated
     """
     # 1. Alpha Vantage
-    if av.get_rate_status()["configured"] and av.get_rate_status()["within_limit"]:
+    if av.is_available():
         result = await av.fetch_quote(symbol)
         if result:
             meta = COMPANY_META.get(symbol, {"name": symbol, "sector": "Unknown", "beta": 1.0})
@@ -274,7 +274,7 @@ async def get_history(symbol: str, days: int = 90) -> List[Dict[str, Any]]:
     Cascade: Alpha Vantage → Yahoo Finance → Simulated
     """
     # 1. Alpha Vantage
-    if av.get_rate_status()["configured"] and av.get_rate_status()["within_limit"]:
+    if av.is_available():
         bars = await av.fetch_daily_series(symbol)
         if bars:
             return bars
@@ -290,7 +290,7 @@ async def get_history(symbol: str, days: int = 90) -> List[Dict[str, Any]]:
 
 async def get_company_overview(symbol: str) -> Optional[Dict[str, Any]]:
     """Fetch company fundamentals from Alpha Vantage or return meta defaults."""
-    if av.get_rate_status()["configured"] and av.get_rate_status()["within_limit"]:
+    if av.is_available():
         overview = await av.fetch_overview(symbol)
         if overview:
             return overview
@@ -314,7 +314,7 @@ async def get_company_overview(symbol: str) -> Optional[Dict[str, Any]]:
 
 async def search_symbol(keywords: str) -> List[Dict[str, Any]]:
     """Search for symbols via Alpha Vantage or local metadata."""
-    if av.get_rate_status()["configured"] and av.get_rate_status()["within_limit"]:
+    if av.is_available():
         results = await av.search_symbol(keywords)
         if results:
             return results
@@ -330,7 +330,7 @@ async def search_symbol(keywords: str) -> List[Dict[str, Any]]:
 
 async def get_news(tickers: List[str]) -> List[Dict[str, Any]]:
     """Fetch news + sentiment from Alpha Vantage."""
-    if av.get_rate_status()["configured"] and av.get_rate_status()["within_limit"]:
+    if av.is_available():
         return await av.fetch_news(tickers)
     return []
 
@@ -13,9 +13,10 @@ from datetime import datetime
 from models.schemas import (
     EnrichedPosition,
     VaRConfig,
-    VaRResult,
+    VaRPointResult,
     MultiVaRResult,
-    DistributionType
+    DistributionType,
+    DISTRIBUTION_BY_VALUE,
 )
 from config import settings
 from services.watsonx_service import watsonx_service
@@ -153,14 +154,7 @@ class VaRCalculator:
                 )
                 
                 # Convert Watson recommendation to DistributionType
-                dist_map = {
-                    'normal': DistributionType.NORMAL,
-                    'student_t': DistributionType.STUDENT_T,
-                    'lognormal': DistributionType.LOGNORMAL,
-                    'exponential': DistributionType.EXPONENTIAL
-                }
-                
-                watson_dist = dist_map.get(
+                watson_dist = DISTRIBUTION_BY_VALUE.get(
                     watson_rec.get('distribution', 'normal'),
                     DistributionType.NORMAL
                 )
@@ -327,7 +321,7 @@ class VaRCalculator:
                 )
                 
                 # Create result
-                result = VaRResult(
+                result = VaRPointResult(
                     confidence_level=confidence_level,
                     time_horizon=time_horizon,
                     var_amount=round(var_amount, 2),
@@ -3,13 +3,12 @@ CLARA — watsonx Orchestrate Service
 Adapter for chatbot calls to IBM watsonx Orchestrate with graceful fallback signaling.
 """
 
-import json
 import logging
 import uuid
-import urllib.error
-import urllib.request
 from typing import Any, Dict, Optional
 
+import httpx
+
 from config import settings
 
 logger = logging.getLogger("CLARA.watsonx_orchestrate")
@@ -21,6 +20,7 @@ class WatsonxOrchestrateService:
         self.api_key = (settings.WATSONX_ORCH_API_KEY or "").strip()
         self.agent_id = (settings.WATSONX_ORCH_AGENT_ID or "").strip()
         self.timeout = max(5, settings.WATSONX_ORCH_TIMEOUT_SECONDS)
+        self._client: Optional[httpx.AsyncClient] = None
 
     @property
     def enabled(self) -> bool:
@@ -31,6 +31,22 @@ class WatsonxOrchestrateService:
             and self.api_key != "your_orchestrate_api_key_here"
         )
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled keep-alive client, created on first use and reused for every call."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=2.0),
+                limits=httpx.Limits(max_keepalive_connections=20),
+                headers={"Authorization": f"Bearer {self.api_key}"},
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     def _build_url(self) -> str:
         path = (settings.WATSONX_ORCH_CHAT_PATH or "/v1/chat/completions").strip()
         if not path.startswith("/"):
@@ -97,22 +113,12 @@ class WatsonxOrchestrateService:
         if context:
             body["context"] = context
 
-        req = urllib.request.Request(
-            url,
-            data=json.dumps(body).encode("utf-8"),
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}",
-            },
-            method="POST",
-        )
-
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                raw = resp.read().decode("utf-8")
-                data = json.loads(raw)
-        except urllib.error.HTTPError as e:
-            detail = e.read().decode("utf-8", errors="ignore") if hasattr(e, "read") else str(e)
+            resp = await self.client.post(url, json=body)
+            resp.raise_for_status()
+            data = resp.json()
+        except httpx.HTTPStatusError as e:
+            detail = e.response.text
             logger.warning("watsonx Orchestrate HTTP error: %s", detail)
             return {
                 "reply": "",
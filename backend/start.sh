@@ -5,4 +5,4 @@
 PORT=${PORT:-8000}
 
 echo "Starting CLARA backend on port $PORT..."
-uvicorn main:app --host 0.0.0.0 --port $PORT
+PORT=$PORT exec python run.py